@@ -1,6 +1,19 @@
 # -*- coding: utf-8 -*-
+import importlib
 import streamlit as st
-from src.pages import home, resume_builder, portfolio_builder
+
+# Page name -> module. A page module (and ReportLab, the portfolio models,
+# ... behind it) is imported the first time the page is opened, not at startup.
+PAGES = {
+    'Home': 'src.pages.home',
+    'Resume Builder': 'src.pages.resume_builder',
+    'Portfolio Builder': 'src.pages.portfolio_builder',
+}
+
+
+def load_page(name: str):
+    """Imports the page module on first use; later calls hit sys.modules."""
+    return importlib.import_module(PAGES[name])
 
 st.set_page_config(
     page_title='Zenith AI - Resume & Portfolio Builder', 
@@ -96,17 +109,13 @@ def main():
         # Navigation
         page = st.sidebar.radio(
             'Navigation',
-            ['Home', 'Resume Builder', 'Portfolio Builder'],
+            list(PAGES),
             label_visibility='collapsed'
         )
     
     # Route to pages
-    if page == 'Home':
-        home.show()
-    elif page == 'Resume Builder':
-        resume_builder.show()
-    elif page == 'Portfolio Builder':
-        portfolio_builder.show()
+    if page in PAGES:
+        load_page(page).show()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+End-to-end cost of the AI-assisted resume flows, against the offline stub.
+
+  sequential cold: one generate_ai_content call per experience bullet,
+                   empty response cache (the page-by-page path)
+  sequential warm: the same prompts again, answered from the cache
+  batch:           the same bullets through generate_batch (concurrent)
+  stream:          the summary through stream_ai_content; reports time to
+                   first chunk next to the total
+  sessions:        N threads asking the same templated prompt at once
+                   (coalesced into one model call)
+
+"calls" is how many requests reached the backend. The response cache lives
+in a temporary directory, so no real cache is touched.
+
+Run from the repository root:
+    python benchmarks/bench_ai_flows.py [--latency 0.5] [--jitter 0.1] [--entries 12]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+_cache_dir = tempfile.TemporaryDirectory()
+os.environ["AI_CACHE_PATH"] = os.path.join(_cache_dir.name, "ai_cache.sqlite3")
+# The warm and cleared-cache flows need the cache on, whatever the environment says
+os.environ["AI_CACHE_TTL_SECONDS"] = str(24 * 60 * 60)
+
+from src.utils import ai_utils
+from src.utils.ai_backends import StubBackend, set_backend
+from src.utils.ai_batch import generate_batch
+
+ROLES = ["Data Analyst", "Backend Engineer", "Product Designer", "Research Scientist"]
+
+
+def make_prompts(entries):
+    bullets = []
+    for i in range(entries):
+        role = ROLES[i % len(ROLES)]
+        bullets.append(
+            f"Rewrite this resume bullet for a {role} so it leads with impact and a metric: "
+            f"'Worked on project {i} with the team and improved the process.'"
+        )
+    summary = "Write a three sentence professional summary for a Backend Engineer with 6 years of experience."
+    return bullets, summary
+
+
+def timed_calls(prompts):
+    latencies = []
+    for prompt in prompts:
+        start = time.perf_counter()
+        ai_utils.generate_ai_content(prompt)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def describe(latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"{statistics.median(ordered) * 1000:>9.1f}{p95 * 1000:>9.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--latency", type=float, default=0.5, help="stub seconds per answer")
+    parser.add_argument("--jitter", type=float, default=0.1, help="stub latency jitter (seconds)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--entries", type=int, default=12, help="experience bullets to rewrite")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--sessions", type=int, default=8, help="threads sending the same prompt")
+    args = parser.parse_args()
+
+    stub = StubBackend(latency=args.latency, jitter=args.jitter, seed=args.seed)
+    set_backend(stub)
+    bullets, summary = make_prompts(args.entries)
+    rows = []
+
+    def run(flow, fn):
+        calls = stub.calls
+        start = time.perf_counter()
+        detail = fn()
+        rows.append((flow, time.perf_counter() - start, stub.calls - calls, detail))
+
+    run("sequential cold", lambda: describe(timed_calls(bullets)))
+    run("sequential warm", lambda: describe(timed_calls(bullets)))
+
+    ai_utils.get_ai_cache().clear()
+    run("batch", lambda: (generate_batch(bullets, concurrency=args.concurrency, rpm=0), "")[1])
+
+    ai_utils.get_ai_cache().clear()
+    stream = ai_utils.stream_ai_content(summary)
+    run("stream", lambda: (list(stream), f"{stream.time_to_first_chunk * 1000:>9.1f}{'':>9}")[1])
+
+    ai_utils.get_ai_cache().clear()
+    shared = f"Suggest five skills to list for a {ROLES[0]}."
+
+    def sessions():
+        threads = [threading.Thread(target=ai_utils.generate_ai_content, args=(shared,)) for _ in range(args.sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return ""
+
+    run(f"sessions x{args.sessions}", sessions)
+
+    print(f"stub latency {args.latency}s ± {args.jitter}s, {args.entries} bullets, concurrency {args.concurrency}")
+    print(f"{'flow':<18}{'wall s':>8}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}")
+    for flow, wall, calls, detail in rows:
+        print(f"{flow:<18}{wall:>8.2f}{calls:>7}{detail}")
+    print("stream: p50 column is time to first chunk")
+    print(f"cache: {ai_utils.get_ai_cache().stats()}")
+    print(f"single-flight: {ai_utils.single_flight_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Peak memory of the ReportLab resume renderer against CV length.
+
+  full:      ResumeRenderer.render_to_bytes - whole story and PDF held in memory
+  streaming: ResumeRenderer.render_streaming - flowables pulled on demand,
+             PDF written to a SpooledTemporaryFile
+
+Every (mode, entries) pair runs in a fresh interpreter so the reported peak
+RSS belongs to that render alone.
+
+Run from the repository root:
+    python benchmarks/bench_resume_streaming.py [entries ...]
+"""
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+DEFAULT_ENTRIES = [50, 200, 800, 2000]
+
+
+def make_resume(entries):
+    return {
+        "name": "Jane Doe",
+        "role": "Research Scientist",
+        "email": "jane@example.com",
+        "summary": "Researcher with a long publication record. " * 4,
+        "skills": [f"Skill {i}" for i in range(20)],
+        "experience": [
+            {"title": f"Position {i}", "company": f"Institute {i}", "years": "2001-2003",
+             "details": [f"Led study {i}.{j} on a topic worth describing at some length." for j in range(3)]}
+            for i in range(entries // 2)
+        ],
+        "projects": [
+            {"name": f"Publication {i}", "role": "First author",
+             "description": "Abstract of the paper, long enough to wrap over a couple of lines in the PDF. " * 2}
+            for i in range(entries - entries // 2)
+        ],
+    }
+
+
+def run_child(mode, entries):
+    from src.utils.resume_pdf_template import ResumeRenderer
+
+    data = make_resume(entries)
+    renderer = ResumeRenderer()
+    start = time.perf_counter()
+    if mode == "full":
+        size = len(renderer.render_to_bytes(data))
+    else:
+        with renderer.render_streaming(data) as spool:
+            spool.seek(0, 2)
+            size = spool.tell()
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{peak_mb:.1f} {elapsed * 1000:.0f} {size}")
+
+
+def main():
+    entries_list = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ENTRIES
+    print(f"{'entries':>8}{'mode':>11}{'peak RSS MB':>13}{'ms':>8}{'PDF KB':>9}")
+    for entries in entries_list:
+        for mode in ("full", "streaming"):
+            out = subprocess.run(
+                [sys.executable, __file__, "--child", mode, str(entries)],
+                capture_output=True, text=True, check=True, cwd=ROOT,
+            ).stdout.split()
+            peak_mb, ms, size = float(out[0]), int(out[1]), int(out[2])
+            print(f"{entries:>8}{mode:>11}{peak_mb:>13.1f}{ms:>8}{size / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Cold import time of the Streamlit entry point and each page module.
+
+Every module is imported in a fresh interpreter with `python -X importtime`,
+so the numbers include everything it drags in. The last column lists the
+heavy libraries that import pulled into the process; with lazy page loading
+`app` should load none of them, and a page only what it renders with.
+
+Run from the repository root:
+    python benchmarks/bench_startup_imports.py [module ...]
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_MODULES = [
+    "streamlit",
+    "app",
+    "src.pages.home",
+    "src.pages.resume_builder",
+    "src.pages.portfolio_builder",
+    "src.utils.resume_pdf_template",
+    "src.utils.portfolio_export",
+    "src.utils.ai_utils",
+]
+
+HEAVY = ["reportlab", "weasyprint", "google.generativeai", "pandas", "sqlalchemy", "brotli"]
+
+
+def import_profile(module):
+    """Returns ({module: (self_us, cumulative_us)}, error) for one cold import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=ROOT,
+    )
+    timings = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            timings[name] = (int(self_us), int(cumulative_us))
+    error = None
+    if proc.returncode != 0:
+        error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+    return timings, error
+
+
+def main():
+    modules = sys.argv[1:] or DEFAULT_MODULES
+    print(f"{'module':<34}{'cumulative ms':>15}{'modules':>9}  heavy imports")
+    for module in modules:
+        timings, error = import_profile(module)
+        if error:
+            print(f"{module:<34}{'-':>15}{'-':>9}  failed: {error}")
+            continue
+        cumulative_ms = timings.get(module, (0, 0))[1] / 1000
+        heavy = [name for name in HEAVY if name in timings]
+        print(f"{module:<34}{cumulative_ms:>15.1f}{len(timings):>9}  {', '.join(heavy) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
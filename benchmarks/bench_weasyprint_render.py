@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Per-render cost of the resume WeasyPrint path with and without shared resources.
+
+  baseline: stylesheet inlined as <style> and parsed on every render, with a
+            fresh font configuration and no resource cache (the old path)
+  shared:   pre-parsed CSS passed through stylesheets=, one FontConfiguration
+            and one resource cache for the whole process (render_resume_pdf)
+
+Run from the repository root:
+    python benchmarks/bench_weasyprint_render.py [iterations]
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from weasyprint import HTML
+from src.utils.resume_html_pdf import (
+    STYLESHEET_PATH, WARMUP_PAYLOAD, build_resume_html, render_resume_pdf,
+)
+
+PAYLOAD = dict(
+    WARMUP_PAYLOAD,
+    area_of_expertise=[f"Skill {i}" for i in range(12)],
+    key_achievements=[f"Delivered project {i} ahead of schedule" for i in range(6)],
+    experience=[
+        {"title": f"Engineer {i}", "company": f"Company {i}", "years": "2018-2020",
+         "description": "Designed, built and operated services used by millions of people. " * 3}
+        for i in range(8)
+    ],
+)
+
+
+def render_baseline(data):
+    css = STYLESHEET_PATH.read_text(encoding="utf-8")
+    html = build_resume_html(data).replace("</head>", f"<style>{css}</style></head>", 1)
+    return HTML(string=html).write_pdf()
+
+
+def measure(render, iterations):
+    render(PAYLOAD)  # first render pays one-off process setup for either path
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        render(PAYLOAD)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    results = {
+        "baseline": measure(render_baseline, iterations),
+        "shared": measure(render_resume_pdf, iterations),
+    }
+    print(f"{'path':<10}{'mean ms':>10}{'median ms':>12}{'p95 ms':>10}")
+    for name, timings in results.items():
+        p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+        print(f"{name:<10}{statistics.mean(timings):>10.1f}{statistics.median(timings):>12.1f}{p95:>10.1f}")
+    baseline = statistics.median(results["baseline"])
+    shared = statistics.median(results["shared"])
+    print(f"\nsaving per render: {baseline - shared:.1f} ms ({(baseline - shared) / baseline:.0%} of baseline median)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+# test_resume_api.py posts to a running server when imported; it is a manual
+# script, not part of the pytest suite
+collect_ignore = ["test_resume_api.py"]
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import os
 from flask import Flask
 from src.models.database import Base, engine
 from src.api.resume_routes import resume_bp # Import the new resume blueprint
@@ -7,10 +8,32 @@ from dotenv import load_dotenv # Import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
-def create_app():
+def create_app(serving=True):
     app = Flask(__name__)
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///test.db'
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    # Pre-warmed WeasyPrint worker processes (0 renders in the request thread instead);
+    # workers are recycled after N renders or once their RSS passes the threshold
+    app.config['RESUME_RENDER_WORKERS'] = int(os.environ.get('RESUME_RENDER_WORKERS', 2))
+    app.config['RESUME_RENDER_MAX_RENDERS_PER_WORKER'] = 200
+    app.config['RESUME_RENDER_MAX_RSS_MB'] = 512
+    app.config['RESUME_RENDER_TIMEOUT'] = 60
+    # Start the workers with the app; a process that serves no requests leaves them off
+    app.config['RESUME_START_RENDER_POOL'] = serving
+    # Rendered PDF cache: memory LRU in front of a size-bounded disk directory
+    app.config['RESUME_PDF_CACHE_DIR'] = os.environ.get('RESUME_PDF_CACHE_DIR')
+    app.config['RESUME_PDF_CACHE_MEMORY_BYTES'] = 32 * 1024 * 1024
+    app.config['RESUME_PDF_CACHE_DISK_BYTES'] = 512 * 1024 * 1024
+    # Responses stream from a spooled file that moves to disk above this size
+    app.config['RESUME_PDF_SPOOL_MAX_BYTES'] = int(os.environ.get('RESUME_PDF_SPOOL_MAX_BYTES', 1024 * 1024))
+    app.config['RESUME_PDF_STREAM_CHUNK_BYTES'] = 64 * 1024
+    # Batch endpoint: render threads and maximum payloads per request
+    app.config['RESUME_BATCH_WORKERS'] = None  # defaults to min(4, CPU count)
+    app.config['RESUME_BATCH_MAX_ITEMS'] = 500
+    # Async render jobs: worker threads and queue bound (state lives in the database)
+    app.config['RESUME_JOB_OUTPUT_DIR'] = os.environ.get('RESUME_JOB_OUTPUT_DIR')
+    app.config['RESUME_JOB_WORKERS'] = 2
+    app.config['RESUME_JOB_MAX_PENDING'] = 100
 
     with app.app_context():
         Base.metadata.create_all(bind=engine)
@@ -24,5 +47,8 @@ def create_app():
     return app
 
 if __name__ == '__main__':
-    app = create_app()
+    # With debug=True this runs twice: in the reloader, which only watches
+    # files and restarts the server, and in its child (WERKZEUG_RUN_MAIN set),
+    # which serves requests
+    app = create_app(serving=os.environ.get('WERKZEUG_RUN_MAIN') == 'true')
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,16 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.api import render_jobs
+from src.models.database import Base
+
+
+@pytest.fixture
+def job_db(tmp_path, monkeypatch):
+    """Points the render job queue at a fresh SQLite file instead of ./test.db."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(render_jobs, "SessionLocal", session_factory)
+    yield session_factory
+    engine.dispose()
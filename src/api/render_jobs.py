@@ -0,0 +1,225 @@
+import logging
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from src.models.database import SessionLocal
+from src.models.render_job import RenderJob, utcnow
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """Raised when the number of queued and running jobs has reached its limit."""
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists but belongs to someone else
+    return True
+
+
+class RenderJobQueue:
+    """
+    Runs resume renders off the request thread.
+
+    Job state lives in the render_jobs table so clients can poll it and so
+    queued or interrupted jobs are picked up again after a restart. Finished
+    PDFs are written to `output_dir` and referenced by path from the job row.
+
+    Several processes may share the table (e.g. gunicorn workers, or the
+    reloader parent and child). A job is claimed with a conditional UPDATE,
+    so only one of them runs it, and the claiming process refreshes the
+    job's heartbeat while it renders. A running job is only handed to
+    another process once its heartbeat is older than `stale_after` seconds
+    or its owner is a dead process on this host.
+    """
+
+    def __init__(self, render, output_dir: str, max_workers: int = 2, max_pending: int = 100,
+                 heartbeat_interval: float = 10.0, stale_after: float = 60.0):
+        self._render = render
+        self.output_dir = output_dir
+        self.max_pending = max_pending
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_after = stale_after
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='resume-job')
+        self._pending = 0
+        self._running = 0
+        self._lock = threading.Lock()
+        os.makedirs(output_dir, exist_ok=True)
+        self._heartbeat = None  # started by start() or the first submit
+
+    def start(self) -> int:
+        """
+        Starts the heartbeat and re-schedules unfinished jobs (see
+        resume_unfinished). Call once the process begins serving requests.
+        """
+        self._start_heartbeat()
+        return self.resume_unfinished()
+
+    def _start_heartbeat(self):
+        with self._lock:
+            if self._heartbeat is None:
+                self._heartbeat = threading.Thread(target=self._beat, name="resume-job-heartbeat", daemon=True)
+                self._heartbeat.start()
+
+    def submit(self, payload: dict) -> str:
+        """Stores a new job and schedules it. Returns the job id."""
+        self._start_heartbeat()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise JobQueueFull(f"Too many pending render jobs (limit {self.max_pending})")
+            self._pending += 1
+
+        job_id = uuid.uuid4().hex
+        db = SessionLocal()
+        try:
+            db.add(RenderJob(id=job_id, status=RenderJob.QUEUED, payload=payload))
+            db.commit()
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+            raise
+        finally:
+            db.close()
+
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def _is_stale(self, job, cutoff) -> bool:
+        if job.heartbeat_at is None or job.heartbeat_at < cutoff:
+            return True
+        host, _, pid = (job.owner or "").rpartition(":")
+        return host == socket.gethostname() and pid.isdigit() and not _process_alive(int(pid))
+
+    def resume_unfinished(self) -> int:
+        """
+        Re-schedules queued jobs and running jobs abandoned by a dead or
+        stalled process. Jobs another live process is rendering are left alone.
+        """
+        cutoff = utcnow() - timedelta(seconds=self.stale_after)
+        db = SessionLocal()
+        try:
+            requeued = 0
+            running = db.query(RenderJob).filter(RenderJob.status == RenderJob.RUNNING).all()
+            for job in running:
+                if not self._is_stale(job, cutoff):
+                    continue
+                # Only if nobody else has requeued or finished it meanwhile
+                requeued += (
+                    db.query(RenderJob)
+                    .filter(RenderJob.id == job.id, RenderJob.status == RenderJob.RUNNING,
+                            RenderJob.owner == job.owner)
+                    .update({RenderJob.status: RenderJob.QUEUED, RenderJob.owner: None},
+                            synchronize_session=False)
+                )
+            db.commit()
+            job_ids = [
+                job_id for (job_id,) in
+                db.query(RenderJob.id)
+                .filter(RenderJob.status == RenderJob.QUEUED)
+                .order_by(RenderJob.created_at)
+            ]
+        finally:
+            db.close()
+
+        with self._lock:
+            self._pending += len(job_ids)
+        for job_id in job_ids:
+            self._executor.submit(self._run, job_id)
+        if job_ids:
+            logger.info(f"Resumed {len(job_ids)} unfinished render jobs ({requeued} abandoned while running)")
+        return len(job_ids)
+
+    def get(self, job_id: str):
+        """Returns a detached RenderJob, or None if the id is unknown."""
+        db = SessionLocal()
+        try:
+            job = db.get(RenderJob, job_id)
+            if job is not None:
+                db.expunge(job)
+            return job
+        finally:
+            db.close()
+
+    def _claim(self, db, job_id: str) -> bool:
+        """Marks the job running for this process if it is still queued. True if we got it."""
+        claimed = (
+            db.query(RenderJob)
+            .filter(RenderJob.id == job_id, RenderJob.status == RenderJob.QUEUED)
+            .update({RenderJob.status: RenderJob.RUNNING, RenderJob.owner: self.owner,
+                     RenderJob.heartbeat_at: utcnow()}, synchronize_session=False)
+        )
+        db.commit()
+        return claimed == 1
+
+    def _beat(self):
+        while True:
+            time.sleep(self.heartbeat_interval)
+            if not self._running:
+                continue
+            db = SessionLocal()
+            try:
+                (
+                    db.query(RenderJob)
+                    .filter(RenderJob.owner == self.owner, RenderJob.status == RenderJob.RUNNING)
+                    .update({RenderJob.heartbeat_at: utcnow()}, synchronize_session=False)
+                )
+                db.commit()
+            except Exception as e:
+                logger.error(f"Could not refresh render job heartbeats: {e}")
+            finally:
+                db.close()
+
+    def _write_pdf(self, job_id: str, pdf_bytes: bytes) -> str:
+        # Written under a temporary name and renamed, so a reader never sees a partial PDF
+        pdf_path = os.path.join(self.output_dir, f"{job_id}.pdf")
+        fd, tmp_path = tempfile.mkstemp(dir=self.output_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, pdf_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return pdf_path
+
+    def _run(self, job_id: str):
+        db = SessionLocal()
+        claimed = False
+        try:
+            if not self._claim(db, job_id):
+                return  # finished, or claimed by another process
+            claimed = True
+            with self._lock:
+                self._running += 1
+            job = db.get(RenderJob, job_id)
+
+            try:
+                pdf_path = self._write_pdf(job_id, self._render(job.payload))
+            except Exception as e:
+                logger.error(f"Render job {job_id} failed: {e}")
+                job.status = RenderJob.FAILED
+                job.error = str(e)
+            else:
+                job.status = RenderJob.DONE
+                job.pdf_path = pdf_path
+            db.commit()
+        except Exception as e:
+            logger.error(f"Could not update render job {job_id}: {e}")
+        finally:
+            db.close()
+            with self._lock:
+                self._pending -= 1
+                if claimed:
+                    self._running -= 1
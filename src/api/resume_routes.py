@@ -1,137 +1,355 @@
-import html
-from flask import Blueprint, request, jsonify, send_file, current_app
-from io import BytesIO
-from weasyprint import HTML, CSS
+import json
+import os
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from flask import Blueprint, Response, request, jsonify, send_file, current_app, stream_with_context, url_for
+from src.utils.pdf_cache import PDFRenderCache, payload_cache_key
+from src.utils.zip_stream import ZipStreamWriter
+from src.api.render_jobs import RenderJobQueue, JobQueueFull
+from src.models.render_job import RenderJob
+from src.utils.resume_html_pdf import template_version, render_resume_pdf
+from src.utils.render_pool import RenderWorkerPool, RenderPoolUnavailable
 
 resume_bp = Blueprint('resume', __name__, url_prefix='/resume')
 
+_pdf_cache = None
+_job_queue = None
+_jobs_started = False
+_render_pool = None
+_render_pool_config = None
+_render_pool_lock = threading.Lock()
+_render_timeout = None
+
+
+@resume_bp.record_once
+def _load_resume_template(state):
+    # Compile the template and parse the stylesheet up front; later edits to
+    # either file are picked up on the next render
+    template_version()
+
+
+@resume_bp.record_once
+def _init_render_pool(state):
+    # Started with the app so workers spawn and warm up before the first
+    # request; renders stay in-process until one of them is ready. An app
+    # created with RESUME_START_RENDER_POOL off (the reloader parent under
+    # app.run(debug=True), which serves nothing) only starts it on first use
+    global _render_pool_config, _render_timeout
+    config = state.app.config
+    _render_timeout = config.get('RESUME_RENDER_TIMEOUT', 60)
+    workers = config.get('RESUME_RENDER_WORKERS', 2)
+    if workers:
+        _render_pool_config = dict(
+            workers=workers,
+            max_renders=config.get('RESUME_RENDER_MAX_RENDERS_PER_WORKER', 200),
+            max_rss_mb=config.get('RESUME_RENDER_MAX_RSS_MB', 512),
+        )
+        if config.get('RESUME_START_RENDER_POOL', True):
+            _get_render_pool()
+
+
+def _get_render_pool():
+    """The worker pool, started if it is not running yet; None when disabled. Shut down at exit."""
+    global _render_pool
+    if _render_pool is None and _render_pool_config is not None:
+        with _render_pool_lock:
+            if _render_pool is None:
+                # RenderWorkerPool registers its own shutdown with atexit
+                _render_pool = RenderWorkerPool(**_render_pool_config)
+    return _render_pool
+
+
+@resume_bp.record_once
+def _init_pdf_cache(state):
+    global _pdf_cache
+    config = state.app.config
+    _pdf_cache = PDFRenderCache(
+        directory=config.get('RESUME_PDF_CACHE_DIR') or os.path.join(state.app.instance_path, 'pdf_cache'),
+        memory_max_bytes=config.get('RESUME_PDF_CACHE_MEMORY_BYTES', 32 * 1024 * 1024),
+        disk_max_bytes=config.get('RESUME_PDF_CACHE_DISK_BYTES', 512 * 1024 * 1024),
+    )
+
+
+@resume_bp.record_once
+def _init_job_queue(state):
+    global _job_queue
+    config = state.app.config
+    _job_queue = RenderJobQueue(
+        render=lambda data: _render_cached(data)[0],
+        output_dir=config.get('RESUME_JOB_OUTPUT_DIR') or os.path.join(state.app.instance_path, 'render_jobs'),
+        max_workers=config.get('RESUME_JOB_WORKERS', 2),
+        max_pending=config.get('RESUME_JOB_MAX_PENDING', 100),
+    )
+
+
+@resume_bp.before_app_request
+def _start_job_queue():
+    # Deferred to the first request so the reloader parent, which serves
+    # none, never runs a heartbeat or picks up jobs next to its child
+    global _jobs_started
+    if _jobs_started:
+        return
+    _jobs_started = True
+    try:
+        _job_queue.start()
+    except Exception as e:
+        current_app.logger.error(f"Could not resume unfinished render jobs: {e}")
+
+
+def _validate_resume_payload(data):
+    """Returns an error message for an invalid payload, or None if it can be rendered."""
+    if not data:
+        return "Invalid or missing JSON data"
+
+    # Validate required fields
+    required_fields = ['personal_info', 'experience', 'education']
+    for field in required_fields:
+        if field not in data:
+            return f"Missing required field: {field}"
+
+    # Validate data types
+    if not isinstance(data.get('personal_info', {}), dict):
+        return "'personal_info' must be a dictionary"
+    if not isinstance(data.get('about_me', ''), str):
+        return "'about_me' must be a string"
+    for field in ['area_of_expertise', 'key_achievements', 'experience', 'education']:
+        if not isinstance(data.get(field, []), list):
+            return f"'{field}' must be a list"
+    for field in ['experience', 'education']:
+        for index, item in enumerate(data[field]):
+            if not isinstance(item, dict):
+                return f"'{field}[{index}]' must be a dictionary"
+    return None
+
+
+def _render_pdf_bytes(data):
+    # Renders happen in the pre-warmed worker processes unless the pool is
+    # disabled, broken or still warming up
+    pool = _get_render_pool()
+    if pool is None or not pool.is_ready():
+        return render_resume_pdf(data)
+    try:
+        return pool.render(data, timeout=_render_timeout)
+    except RenderPoolUnavailable:
+        # The pool broke or shut down before a worker took this render
+        return render_resume_pdf(data)
+
+
+def _render_cached(data):
+    """Returns (pdf_bytes, cache_key, tier) for an already validated payload."""
+    cache_key = payload_cache_key(data, template_version())
+    pdf_bytes, tier = _pdf_cache.get_or_render(cache_key, lambda: _render_pdf_bytes(data))
+    return pdf_bytes, cache_key, tier
+
+
+def _spooled_pdf_response(pdf_bytes, filename='resume.pdf'):
+    """
+    Streams a PDF back in fixed-size chunks from a SpooledTemporaryFile.
+
+    Documents above RESUME_PDF_SPOOL_MAX_BYTES are moved to a temp file before
+    the response starts, so a slow download holds an open file rather than
+    the whole document in worker memory.
+    """
+    config = current_app.config
+    chunk_size = config.get('RESUME_PDF_STREAM_CHUNK_BYTES', 64 * 1024)
+    spool = tempfile.SpooledTemporaryFile(max_size=config.get('RESUME_PDF_SPOOL_MAX_BYTES', 1024 * 1024))
+    spool.write(pdf_bytes)
+    length = spool.tell()
+    spool.seek(0)
+
+    def generate():
+        try:
+            while True:
+                chunk = spool.read(chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            # Also reached when the client disconnects mid-download
+            spool.close()
+
+    return Response(
+        generate(),
+        mimetype='application/pdf',
+        headers={
+            'Content-Length': str(length),
+            'Content-Disposition': f'attachment; filename={filename}',
+        },
+        direct_passthrough=True,
+    )
+
+
 @resume_bp.route('/generate-pdf', methods=['POST'])
 def generate_resume_pdf():
     try:
         data = request.get_json(silent=True)
-        if not data:
-            return jsonify({"error": "Invalid or missing JSON data"}), 400
-
-        # Validate required fields        required_fields = ['personal_info', 'about_me', 'skills', 'education', 'experience', 'projects', 'contacts']
-
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400                
-        # Validate data types
-        if not isinstance(data.get('personal_info', {}), dict):
-            return jsonify({"error": "'personal_info' must be a dictionary"}), 400
-
-        if not isinstance(data.get('about_me', ''), str):
-            return jsonify({"error": "'about_me' must be a string"}), 400
-        # Data is already extracted from request.get_json() at line 10
-        # Validation ensures required fields exist        }
-
-        # Generate HTML content from the provided data
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Resume</title>
-            <style>
-                body {
-                    line-height: 1.6;
-                    color: #333;
-                    margin: 0;
-                    padding: 0;
-                    font-size: 10pt;
-                }
-                .container {
-                    width: 100%;
-                    margin: auto;
-                    padding: 20px;
-                    box-sizing: border-box;
-                }
-                .header {
-                    text-align: center;
-                    margin-bottom: 20px;
-                }
-                .header h1 {
-                    margin: 0;
-                    color: #222;
-                    font-size: 24pt;
-                }
-                .header p {
-                    margin: 5px 0;
-                    font-size: 12pt;
-                }
-                .section {
-                    margin-bottom: 15px;
-                }
-                .section-title {
-                    font-size: 14pt;
-                    color: #555;
-                    border-bottom: 1px solid #eee;
-                    padding-bottom: 5px;
-                    margin-bottom: 10px;
-                }
-                .item-title {
-                    font-weight: bold;
-                    font-size: 11pt;
-                }
-                .item-details {
-                    margin-left: 15px;
-                    font-size: 10pt;
-                }
-                ul {
-                    list-style-type: disc;
-                    margin-left: 20px;
-                    padding-left: 0;
-                }
-                ul li {
-                    margin-bottom: 5px;
-                }
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <p>{html.escape(data.get('personal_info', {}).get('role', ''))}</p>
-                    <p>{html.escape(data.get('personal_info', {}).get('email', ''))} | {html.escape(data.get('personal_info', {}).get('phone', ''))} | {html.escape(data.get('personal_info', {}).get('linkedin', ''))} | {html.escape(data.get('personal_info', {}).get('github', ''))}</p>           
-                </div>
-
-                <div class="section">
-                    <div class="section-title">Area of Expertise</div>
-                    <ul>
-                        {''.join([f'<li>{item}</li>' for item in data.get('area_of_expertise', [])])}
-                    </ul>
-                </div>
-                <div class="section">
-                    <div class="section-title">Key Achievements</div>
-                    <ul>
-                        {''.join([f'<li>{item}</li>' for item in data.get('key_achievements', [])])}
-                    </ul>
-                </div>
-                <div class="section">
-                    <div class="section-title">Experience</div>
-                    {''.join([f'<div class="item-title">{exp.get('title', '')} at {exp.get('company', '')} ({exp.get('years', '')})</div><div class="item-details">{exp.get('description', '')}</div>' for exp in data.get('experience', [])])}
-                </div>
-                <div class="section">
-                    <div class="section-title">Education</div>
-                    {''.join([f'<div class="item-title">{edu.get('degree', '')} from {edu.get('university', '')} ({edu.get('years', '')})</div>' for edu in data.get('education', [])])}
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-
-        pdf_buffer = BytesIO()
-
-        HTML(string=html_content).write_pdf(pdf_buffer)
-
-        pdf_buffer.seek(0)
-
-        return send_file(
-            pdf_buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name='resume.pdf'
-        )
+        error = _validate_resume_payload(data)
+        if error:
+            return jsonify({"error": error}), 400
+
+        # Identical payloads are served from the render cache without any layout work
+        pdf_bytes, cache_key, tier = _render_cached(data)
+
+        response = _spooled_pdf_response(pdf_bytes)
+        response.headers['X-Cache'] = f"HIT-{tier.upper()}" if tier else "MISS"
+        response.headers['ETag'] = f'"{cache_key}"'
+        return response
 
     except Exception as e:
         current_app.logger.error(f"An unexpected error occurred during PDF generation: {e}")
-        return jsonify({"error": "An unexpected error occurred during PDF generation"}), 500
\ No newline at end of file
+        return jsonify({"error": "An unexpected error occurred during PDF generation"}), 500
+
+
+@resume_bp.route('/cache/stats', methods=['GET'])
+def pdf_cache_stats():
+    return jsonify(_pdf_cache.stats())
+
+
+@resume_bp.route('/render-pool/stats', methods=['GET'])
+def render_pool_stats():
+    if _render_pool_config is None:
+        return jsonify({"workers": 0, "enabled": False})
+    if _render_pool is None:
+        return jsonify({"workers": 0, "enabled": True, "started": False})
+    return jsonify(dict(_render_pool.stats(), enabled=True, started=True))
+
+
+def _render_batch_entry(index, data):
+    """Renders one batch entry, returning a manifest record and the PDF bytes (None on failure)."""
+    filename = f"resume_{index + 1:03d}.pdf"
+    record = {"index": index, "filename": filename}
+    if isinstance(data, dict):
+        error = _validate_resume_payload(data)
+    else:
+        error = "Resume payload must be a JSON object"
+    if error:
+        record.update(status="error", error=error)
+        return record, None
+    try:
+        pdf_bytes, _, tier = _render_cached(data)
+    except Exception as e:
+        record.update(status="error", error=f"PDF generation failed: {e}")
+        return record, None
+    record.update(status="ok", bytes=len(pdf_bytes), cache=tier or "miss")
+    return record, pdf_bytes
+
+
+@resume_bp.route('/generate-pdf/batch', methods=['POST'])
+def generate_resume_pdf_batch():
+    """
+    Renders a list of resume payloads across a worker pool and streams back a
+    ZIP archive. PDFs are written to the archive as they finish, and a
+    manifest.json entry at the end records the outcome of every payload, so a
+    bad entry is reported there instead of failing the whole batch.
+
+    Accepts either a JSON list of payloads or {"resumes": [...]}.
+    """
+    data = request.get_json(silent=True)
+    payloads = data.get('resumes') if isinstance(data, dict) else data
+    if not isinstance(payloads, list) or not payloads:
+        return jsonify({"error": "Expected a non-empty list of resume payloads"}), 400
+
+    max_items = current_app.config.get('RESUME_BATCH_MAX_ITEMS', 500)
+    if len(payloads) > max_items:
+        return jsonify({"error": f"Batch too large: at most {max_items} resumes per request"}), 413
+
+    workers = current_app.config.get('RESUME_BATCH_WORKERS') or min(4, os.cpu_count() or 1)
+    logger = current_app.logger
+
+    def generate():
+        writer = ZipStreamWriter()
+        manifest = [None] * len(payloads)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='resume-batch')
+        try:
+            # Keep only a small window of renders in flight so finished PDFs
+            # never pile up in memory faster than the client reads them
+            pending = set()
+            next_index = 0
+            while pending or next_index < len(payloads):
+                while next_index < len(payloads) and len(pending) < workers * 2:
+                    pending.add(executor.submit(_render_batch_entry, next_index, payloads[next_index]))
+                    next_index += 1
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record, pdf_bytes = future.result()
+                    manifest[record["index"]] = record
+                    if pdf_bytes is None:
+                        logger.warning(f"Batch entry {record['index']} failed: {record['error']}")
+                        continue
+                    # PDF streams are already compressed; storing avoids wasted CPU
+                    chunk = writer.add(record["filename"], pdf_bytes, compress_type=zipfile.ZIP_STORED)
+                    if chunk:
+                        yield chunk
+
+            summary = {
+                "total": len(manifest),
+                "succeeded": sum(1 for r in manifest if r["status"] == "ok"),
+                "failed": sum(1 for r in manifest if r["status"] == "error"),
+                "entries": manifest,
+            }
+            yield writer.add("manifest.json", json.dumps(summary, indent=2).encode("utf-8"))
+            yield writer.close()
+        finally:
+            # Also reached when the client disconnects mid-stream
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/zip',
+        headers={'Content-Disposition': 'attachment; filename=resumes.zip'}
+    )
+
+
+def _job_response(job):
+    body = job.to_dict()
+    body["status_url"] = url_for('resume.get_render_job', job_id=job.id)
+    if job.status == RenderJob.DONE:
+        body["result_url"] = url_for('resume.download_render_job', job_id=job.id)
+    return body
+
+
+@resume_bp.route('/jobs', methods=['POST'])
+def create_render_job():
+    """Queues a render and returns its job id immediately (202 Accepted)."""
+    try:
+        data = request.get_json(silent=True)
+        error = _validate_resume_payload(data)
+        if error:
+            return jsonify({"error": error}), 400
+
+        job_id = _job_queue.submit(data)
+        body = _job_response(_job_queue.get(job_id))
+        return jsonify(body), 202, {'Location': body["status_url"]}
+
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 503, {'Retry-After': '5'}
+    except Exception as e:
+        current_app.logger.error(f"An unexpected error occurred while queueing a render job: {e}")
+        return jsonify({"error": "An unexpected error occurred while queueing a render job"}), 500
+
+
+@resume_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_render_job(job_id):
+    job = _job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    return jsonify(_job_response(job))
+
+
+@resume_bp.route('/jobs/<job_id>/pdf', methods=['GET'])
+def download_render_job(job_id):
+    job = _job_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job id"}), 404
+    if job.status == RenderJob.FAILED:
+        return jsonify({"error": f"Render job failed: {job.error}"}), 410
+    if job.status != RenderJob.DONE or not job.pdf_path or not os.path.exists(job.pdf_path):
+        return jsonify(_job_response(job)), 409, {'Retry-After': '1'}
+    return send_file(
+        job.pdf_path,
+        mimetype='application/pdf',
+        as_attachment=True,
+        download_name='resume.pdf'
+    )
@@ -0,0 +1,130 @@
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+import pytest
+from src.api.render_jobs import RenderJobQueue, JobQueueFull
+from src.models.render_job import RenderJob, utcnow
+
+
+def _wait_for(queue, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job.status in (RenderJob.DONE, RenderJob.FAILED):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def _make_queue(tmp_path, render, owner=None, **kwargs):
+    queue = RenderJobQueue(render, str(tmp_path / "render_jobs"), **kwargs)
+    if owner:
+        queue.owner = owner
+    return queue
+
+
+def _add_jobs(job_db, *jobs):
+    db = job_db()
+    db.add_all(jobs)
+    db.commit()
+    db.close()
+
+
+def test_submitted_job_is_rendered_to_a_file(tmp_path, job_db):
+    queue = _make_queue(tmp_path, lambda payload: b"%PDF " + payload["name"].encode())
+    job = _wait_for(queue, queue.submit({"name": "Jane"}))
+    assert job.status == RenderJob.DONE
+    with open(job.pdf_path, "rb") as f:
+        assert f.read() == b"%PDF Jane"
+    assert not [name for name in os.listdir(queue.output_dir) if name.endswith(".tmp")]
+
+
+def test_failed_render_is_recorded(tmp_path, job_db):
+    def render(payload):
+        raise ValueError("bad layout")
+
+    queue = _make_queue(tmp_path, render)
+    job = _wait_for(queue, queue.submit({}))
+    assert job.status == RenderJob.FAILED
+    assert "bad layout" in job.error
+
+
+def test_queue_bound(tmp_path, job_db):
+    release = threading.Event()
+    queue = _make_queue(tmp_path, lambda payload: release.wait() and b"%PDF", max_workers=1, max_pending=1)
+    queue.submit({})
+    try:
+        with pytest.raises(JobQueueFull):
+            queue.submit({})
+    finally:
+        release.set()
+
+
+def test_claim_is_atomic(tmp_path, job_db):
+    _add_jobs(job_db, RenderJob(id="job", status=RenderJob.QUEUED, payload={}))
+    queues = [_make_queue(tmp_path, None, owner=f"host:{i}") for i in range(8)]
+    results = []
+    start = threading.Barrier(len(queues))
+
+    def claim(queue):
+        db = job_db()
+        try:
+            start.wait()
+            results.append(queue._claim(db, "job"))
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=claim, args=(queue,)) for queue in queues]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(results) == [False] * 7 + [True]
+
+
+def test_two_processes_resuming_render_each_job_once(tmp_path, job_db):
+    _add_jobs(job_db, *(RenderJob(id=f"job{i}", status=RenderJob.QUEUED, payload={"n": i}) for i in range(5)))
+    rendered = []
+    lock = threading.Lock()
+
+    def render(payload):
+        with lock:
+            rendered.append(payload["n"])
+        time.sleep(0.01)
+        return b"%PDF"
+
+    first = _make_queue(tmp_path, render, owner="host-a:1")
+    second = _make_queue(tmp_path, render, owner="host-b:1")
+    first.resume_unfinished()
+    second.resume_unfinished()
+    for i in range(5):
+        assert _wait_for(first, f"job{i}").status == RenderJob.DONE
+    time.sleep(0.1)  # let the losing queue finish its no-op claims
+    assert sorted(rendered) == [0, 1, 2, 3, 4]
+
+
+def test_resume_only_requeues_abandoned_running_jobs(tmp_path, job_db):
+    now = utcnow()
+    here = socket.gethostname()
+    _add_jobs(
+        job_db,
+        # Rendering in a live process elsewhere: must be left alone
+        RenderJob(id="live", status=RenderJob.RUNNING, payload={"n": "live"},
+                  owner="elsewhere:1", heartbeat_at=now),
+        # Owner stopped refreshing its heartbeat
+        RenderJob(id="stale", status=RenderJob.RUNNING, payload={"n": "stale"},
+                  owner="elsewhere:2", heartbeat_at=now - timedelta(minutes=5)),
+        # Owner is a process on this host that no longer exists
+        RenderJob(id="dead", status=RenderJob.RUNNING, payload={"n": "dead"},
+                  owner=f"{here}:999999999", heartbeat_at=now),
+    )
+    rendered = []
+    queue = _make_queue(tmp_path, lambda payload: rendered.append(payload["n"]) or b"%PDF", stale_after=60)
+    assert queue.resume_unfinished() == 2
+    assert _wait_for(queue, "stale").status == RenderJob.DONE
+    assert _wait_for(queue, "dead").status == RenderJob.DONE
+    live = queue.get("live")
+    assert (live.status, live.owner) == (RenderJob.RUNNING, "elsewhere:1")
+    assert sorted(rendered) == ["dead", "stale"]
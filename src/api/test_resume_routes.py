@@ -0,0 +1,81 @@
+import io
+import json
+import zipfile
+import pytest
+from flask import Flask
+
+try:
+    import weasyprint  # noqa: F401
+except (ImportError, OSError) as e:  # OSError: Pango/Cairo libraries are missing
+    pytest.skip(f"WeasyPrint is not available: {e}", allow_module_level=True)
+
+from src.api.resume_routes import resume_bp
+
+PAYLOAD = {
+    "personal_info": {"name": "Jane Doe", "role": "Engineer"},
+    "key_achievements": ["Shipped things"],
+    "experience": [{"title": "Engineer", "company": "Example", "years": "2020-2024", "description": "Built things."}],
+    "education": [{"degree": "B.Sc.", "university": "Example University", "years": "2016-2020"}],
+}
+
+
+@pytest.fixture
+def client(tmp_path, job_db):
+    app = Flask(__name__)
+    app.config.update(
+        RESUME_RENDER_WORKERS=0,
+        RESUME_PDF_CACHE_DIR=str(tmp_path / "pdf_cache"),
+        RESUME_JOB_OUTPUT_DIR=str(tmp_path / "render_jobs"),
+    )
+    app.register_blueprint(resume_bp)
+    return app.test_client()
+
+
+def test_batch_streams_a_zip_with_a_manifest(client):
+    payloads = [PAYLOAD, "not a payload", dict(PAYLOAD, about_me="Second resume")]
+    response = client.post("/resume/generate-pdf/batch", json={"resumes": payloads})
+    assert response.status_code == 200
+    assert response.mimetype == "application/zip"
+
+    archive = zipfile.ZipFile(io.BytesIO(response.data))
+    assert archive.testzip() is None
+    assert archive.namelist()[-1] == "manifest.json"
+    manifest = json.loads(archive.read("manifest.json"))
+    assert (manifest["total"], manifest["succeeded"], manifest["failed"]) == (3, 2, 1)
+
+    entries = manifest["entries"]
+    assert [entry["index"] for entry in entries] == [0, 1, 2]
+    assert entries[1]["status"] == "error"
+    for entry in (entries[0], entries[2]):
+        assert entry["status"] == "ok"
+        pdf_bytes = archive.read(entry["filename"])
+        assert pdf_bytes.startswith(b"%PDF")
+        assert len(pdf_bytes) == entry["bytes"]
+    assert "resume_002.pdf" not in archive.namelist()
+
+
+def test_batch_rejects_an_empty_list(client):
+    assert client.post("/resume/generate-pdf/batch", json=[]).status_code == 400
+
+
+def test_repeated_payload_is_served_from_the_cache(client):
+    first = client.post("/resume/generate-pdf", json=PAYLOAD)
+    second = client.post("/resume/generate-pdf", json=dict(reversed(list(PAYLOAD.items()))))
+    assert first.status_code == second.status_code == 200
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT-MEMORY"
+    assert first.headers["ETag"] == second.headers["ETag"]
+    assert first.data == second.data
+
+
+@pytest.mark.parametrize("field, value", [
+    ("experience", ["x"]),
+    ("education", [{"degree": "B.Sc."}, 3]),
+    ("experience", "not a list"),
+])
+def test_malformed_entries_are_rejected(client, field, value):
+    payload = dict(PAYLOAD, **{field: value})
+    for url in ("/resume/generate-pdf", "/resume/jobs"):
+        response = client.post(url, json=payload)
+        assert response.status_code == 400
+        assert field in response.get_json()["error"]
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Text, DateTime, JSON
+from .database import Base
+
+
+def utcnow():
+    """Current UTC time as a naive datetime, the form SQLite hands DateTime values back in."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class RenderJob(Base):
+    __tablename__ = "render_jobs"
+
+    # Status moves queued -> running -> done | failed
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    id = Column(String(32), primary_key=True, index=True)
+    status = Column(String(16), nullable=False, default=QUEUED, index=True)
+    payload = Column(JSON, nullable=False)
+    pdf_path = Column(String)
+    error = Column(Text)
+    # "host:pid" of the process rendering the job, and the last time that
+    # process confirmed it is still alive; used to spot abandoned running jobs
+    owner = Column(String(128))
+    heartbeat_at = Column(DateTime)
+    created_at = Column(DateTime, default=utcnow, nullable=False)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow, nullable=False)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+    def __repr__(self):
+        return f"<RenderJob(id='{self.id}', status='{self.status}')>"
@@ -1,88 +1,123 @@
 # -*- coding: utf-8 -*-
-import re
 from pathlib import Path
 import streamlit as st
 import streamlit.components.v1 as components
-import pandas as pd
 from src.data.portfolio_data import PortfolioData, PersonalInfo, AboutMe, Experience, Education, Project, Contact, Skill
-from src.utils.portfolio_generator import generate_portfolio_html
+from src.utils.portfolio_assets import get_portfolio_css, get_portfolio_js
+from src.utils.streamlit_perf import fragment, show_rerun_stats, track_page
 
 
 # ---------- Dynamic portfolio HTML builder ----------
 
-def build_portfolio_from_data(pdata: PortfolioData, css_src: str, js_src: str) -> str:
-    """
-    Build a complete HTML portfolio using the exact template structure.
-    Matches portfolio.html DOM so portfolio.css styles apply correctly.
-    """
-    # Extract user data safely
-    name = getattr(pdata.personal_info, "name", "Your Name") or "Your Name"
-    role = getattr(pdata.personal_info, "role", "Your Profession") or "Your Profession"
-    intro = getattr(pdata.personal_info, "introduction", "") or ""
-    
-    bio = getattr(pdata.about_me, "biography", "") or "Welcome to my portfolio! I am a dedicated and passionate professional with a love for technology and creative problem-solving."
-    
+def _hero_section_html(personal_info: PersonalInfo) -> str:
+    name = getattr(personal_info, "name", "Your Name") or "Your Name"
+    role = getattr(personal_info, "role", "Your Profession") or "Your Profession"
+    return f"""<!-- Hero Section (Home) -->
+        <section id="home">
+            <div class="container">
+                <h1>Hello, I'm {name}</h1>
+                <p>A Passionate {role}</p>
+                <a href="#about" class="cta-button">View My Work</a>
+            </div>
+        </section>"""
+
+
+def _about_section_html(about_me: AboutMe) -> str:
+    bio = getattr(about_me, "biography", "") or "Welcome to my portfolio! I am a dedicated and passionate professional with a love for technology and creative problem-solving."
+
     # Skills list
     skills_html = ""
-    if pdata.about_me and pdata.about_me.skills:
+    if about_me and about_me.skills:
         skills_html = "<ul style='list-style:disc; padding-left:20px; text-align:left; max-width:700px; margin:1rem auto;'>"
-        skills_html += "".join(f"<li>{s.name}</li>" for s in pdata.about_me.skills)
+        skills_html += "".join(f"<li>{s.name}</li>" for s in about_me.skills)
         skills_html += "</ul>"
-    
+    return f"""<!-- About Section -->
+        <section id="about">
+            <div class="container">
+                <h2>About Me</h2>
+                <p>{bio}</p>
+                {skills_html}
+            </div>
+        </section>"""
+
+
+def _education_section_html(education: list) -> str:
     # Education - using timeline structure from original template
     education_html = ""
-    if pdata.education:
-        education_html = '<div class="timeline">'
-        for edu in pdata.education:
-            education_html += f"""
+    if education:
+        education_html = '<div class="timeline">' + "".join(f"""
             <div class="timeline-item">
                 <h3>{edu.degree}</h3>
                 <h4>{edu.institution} | {edu.years}</h4>
                 <p>Focused on relevant coursework and practical applications.</p>
             </div>
-            """
-        education_html += '</div>'
+            """ for edu in education) + '</div>'
     else:
         education_html = "<p>No education entries yet. Add your degrees and certifications!</p>"
-    
+    return f"""<!-- Education Section -->
+        <section id="education">
+            <div class="container">
+                <h2>Education</h2>
+                {education_html}
+            </div>
+        </section>"""
+
+
+def _experience_section_html(experience: list) -> str:
     # Experience - using timeline structure
     experience_html = ""
-    if pdata.experience:
-        experience_html = '<div class="timeline">'
-        for exp in pdata.experience:
-            experience_html += f"""
+    if experience:
+        experience_html = '<div class="timeline">' + "".join(f"""
             <div class="timeline-item">
                 <h3>{exp.role}</h3>
                 <h4>{exp.company} | {exp.years}</h4>
                 <p>{exp.description}</p>
             </div>
-            """
-        experience_html += '</div>'
+            """ for exp in experience) + '</div>'
     else:
         experience_html = "<p>No experience entries yet. Add your work history!</p>"
-    
+    return f"""<!-- Experience Section -->
+        <section id="experience">
+            <div class="container">
+                <h2>Experience</h2>
+                {experience_html}
+            </div>
+        </section>"""
+
+
+def _projects_section_html(projects: list) -> str:
     # Projects - using original styling
     projects_html = ""
-    if pdata.projects:
-        for proj in pdata.projects:
+    if projects:
+        parts = []
+        for proj in projects:
             link_tag = f'<br><a href="{proj.link}" target="_blank" style="color:var(--accent-color); text-decoration:none; font-weight:600;">View Project →</a>' if proj.link else ""
-            projects_html += f"""
+            parts.append(f"""
             <div style="background:rgba(255,255,255,0.05); padding:1.5rem; border-radius:10px; margin-bottom:1.5rem; text-align:left;">
                 <h3>{proj.title}</h3>
                 <p>{proj.description}</p>
                 {link_tag}
             </div>
-            """
+            """)
+        projects_html = "".join(parts)
     else:
         projects_html = "<p>No projects yet. Showcase your best work here!</p>"
-    
-    # Contact
-    email = getattr(pdata.contact, "email", "") or ""
-    phone = getattr(pdata.contact, "phone", "") or ""
-    linkedin = getattr(pdata.contact, "linkedin", "") or ""
-    github = getattr(pdata.contact, "github", "") or ""
-    twitter = getattr(pdata.contact, "twitter", "") or ""
-    
+    return f"""<!-- Projects Section -->
+        <section id="projects">
+            <div class="container">
+                <h2>Projects</h2>
+                {projects_html}
+            </div>
+        </section>"""
+
+
+def _contact_section_html(contact: Contact) -> str:
+    email = getattr(contact, "email", "") or ""
+    phone = getattr(contact, "phone", "") or ""
+    linkedin = getattr(contact, "linkedin", "") or ""
+    github = getattr(contact, "github", "") or ""
+    twitter = getattr(contact, "twitter", "") or ""
+
     contact_items = []
     if email:
         contact_items.append(f"<strong>Email:</strong> <a href='mailto:{email}'>{email}</a>")
@@ -94,9 +129,53 @@ def build_portfolio_from_data(pdata: PortfolioData, css_src: str, js_src: str) -
         contact_items.append(f"<strong>GitHub:</strong> <a href='{github}' target='_blank'>{github}</a>")
     if twitter:
         contact_items.append(f"<strong>Twitter:</strong> <a href='{twitter}' target='_blank'>{twitter}</a>")
-    
+
     contact_html = "<br>".join(contact_items) if contact_items else "<p>Add your contact information to let people reach you!</p>"
-    
+    return f"""<!-- Contact Section -->
+        <section id="contact">
+            <div class="container">
+                <h2>Get In Touch</h2>
+                <p>I'm currently open to new opportunities. Feel free to reach out!</p>
+                <div style="margin-top:2rem; font-size:1rem; line-height:2;">
+                {contact_html}
+                </div>
+            </div>
+        </section>"""
+
+
+def build_portfolio_from_data(pdata: PortfolioData, css_src: str = None, js_src: str = None,
+                              css_href: str = None, js_href: str = None) -> str:
+    """
+    Build a complete HTML portfolio using the exact template structure.
+    Matches portfolio.html DOM so portfolio.css styles apply correctly.
+    css_src / js_src default to the cached, minified portfolio assets.
+    With css_href / js_href the assets are linked instead of inlined
+    (used by the static-site export).
+
+    Each section is rendered by its own function from its own dataclass
+    subtree, and the page is assembled from those fragments.
+    """
+    if css_href:
+        css_block = f'<link rel="stylesheet" href="{css_href}">'
+    else:
+        if css_src is None:
+            css_src = get_portfolio_css().content
+        css_block = f"<style>\n        {css_src}\n        </style>"
+    if js_href:
+        js_block = f'<script src="{js_href}" defer></script>'
+    else:
+        if js_src is None:
+            js_src = get_portfolio_js().content
+        js_block = f"<script>\n        {js_src}\n        </script>"
+
+    name = getattr(pdata.personal_info, "name", "Your Name") or "Your Name"
+    hero_section = _hero_section_html(pdata.personal_info)
+    about_section = _about_section_html(pdata.about_me)
+    education_section = _education_section_html(pdata.education)
+    experience_section = _experience_section_html(pdata.experience)
+    projects_section = _projects_section_html(pdata.projects)
+    contact_section = _contact_section_html(pdata.contact)
+
     # Build the full HTML matching original template structure exactly
     html = f"""
     <!DOCTYPE html>
@@ -108,9 +187,7 @@ def build_portfolio_from_data(pdata: PortfolioData, css_src: str, js_src: str) -
         <link rel="preconnect" href="https://fonts.googleapis.com">
         <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
         <link href="https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700&display=swap" rel="stylesheet">
-        <style>
-        {css_src}
-        </style>
+        {css_block}
     </head>
     <body>
         <!-- Header / Navigation -->
@@ -127,67 +204,24 @@ def build_portfolio_from_data(pdata: PortfolioData, css_src: str, js_src: str) -
             </nav>
         </header>
 
-        <!-- Hero Section (Home) -->
-        <section id="home">
-            <div class="container">
-                <h1>Hello, I'm {name}</h1>
-                <p>A Passionate {role}</p>
-                <a href="#about" class="cta-button">View My Work</a>
-            </div>
-        </section>
+        {hero_section}
 
-        <!-- About Section -->
-        <section id="about">
-            <div class="container">
-                <h2>About Me</h2>
-                <p>{bio}</p>
-                {skills_html}
-            </div>
-        </section>
+        {about_section}
 
-        <!-- Education Section -->
-        <section id="education">
-            <div class="container">
-                <h2>Education</h2>
-                {education_html}
-            </div>
-        </section>
+        {education_section}
 
-        <!-- Experience Section -->
-        <section id="experience">
-            <div class="container">
-                <h2>Experience</h2>
-                {experience_html}
-            </div>
-        </section>
+        {experience_section}
 
-        <!-- Projects Section -->
-        <section id="projects">
-            <div class="container">
-                <h2>Projects</h2>
-                {projects_html}
-            </div>
-        </section>
+        {projects_section}
 
-        <!-- Contact Section -->
-        <section id="contact">
-            <div class="container">
-                <h2>Get In Touch</h2>
-                <p>I'm currently open to new opportunities. Feel free to reach out!</p>
-                <div style="margin-top:2rem; font-size:1rem; line-height:2;">
-                {contact_html}
-                </div>
-            </div>
-        </section>
+        {contact_section}
 
         <!-- Footer -->
         <footer>
             <p>&copy; 2025 {name}. All rights reserved.</p>
         </footer>
 
-        <script>
-        {js_src}
-        </script>
+        {js_block}
     </body>
     </html>
     """
@@ -197,6 +231,7 @@ def build_portfolio_from_data(pdata: PortfolioData, css_src: str, js_src: str) -
 
 # ---------- Main page ----------
 
+@track_page("portfolio_builder")
 def show():
     st.title("Portfolio Builder")
 
@@ -223,71 +258,66 @@ def show():
     elif section == "Contact":
         contact_section()
 
+    show_rerun_stats()
+
     # Preview and export options
     st.sidebar.markdown("---")
     st.sidebar.subheader("Actions")
     if st.sidebar.button("🔍 Preview Portfolio", key="btn_preview_portfolio", use_container_width=True):
         st.subheader("Live Preview")
-    
-        # Resolve paths relative to this file
-        base_dir = Path(__file__).resolve().parent
-        css_path = base_dir / "portfolio.css"
-        js_path = base_dir / "portfolio.js"
-
-        # Check existence
-        if not css_path.exists():
-            st.error(f"{css_path.name} not found at {css_path}. Place it next to portfolio_builder.py.")
-            return
-        if not js_path.exists():
-            st.error(f"{js_path.name} not found at {js_path}. Place it next to portfolio_builder.py.")
-            return
 
-        with open(css_path, "r", encoding="utf-8") as f:
-            css_src = f.read()
-        with open(js_path, "r", encoding="utf-8") as f:
-            js_src = f.read()
-
-        # Build HTML from live data
+        # Build HTML from live data; CSS/JS come from the process-wide asset cache
         pdata = st.session_state["portfolio_data"]
-        portfolio_html = build_portfolio_from_data(pdata, css_src, js_src)
+        try:
+            portfolio_html = build_portfolio_from_data(pdata)
+        except FileNotFoundError as e:
+            st.error(f"{Path(e.filename).name} not found at {e.filename}. Place it next to portfolio_builder.py.")
+            return
 
         # Render via iframe
         components.html(portfolio_html, height=1400, scrolling=True)
 
     if st.sidebar.button("📥 Export Portfolio", key="btn_export_portfolio", use_container_width=True):
-    # portfolio_html = build_portfolio_from_data(st.session_state["portfolio_data"], css_src, js_src)
-    
-            # Resolve paths relative to this file
-        base_dir = Path(__file__).resolve().parent
-        css_path = base_dir / "portfolio.css"
-        js_path = base_dir / "portfolio.js"
-
-    # Check existence
-        if not css_path.exists():
-            st.error(f"{css_path.name} not found at {css_path}. Place it next to portfolio_builder.py.")
-            return
-        if not js_path.exists():
-            st.error(f"{js_path.name} not found at {js_path}. Place it next to portfolio_builder.py.")
-            return
-
-        with open(css_path, "r", encoding="utf-8") as f:
-            css_src = f.read()
-        with open(js_path, "r", encoding="utf-8") as f:
-            js_src = f.read()
+        # Only needed on export; kept out of the page's import cost
+        from src.utils.portfolio_export import build_static_site_zip
+        from src.utils.portfolio_optimize import optimize_portfolio_html
 
         # Build HTML from latest data
         pdata = st.session_state["portfolio_data"]
-        portfolio_html = build_portfolio_from_data(pdata, css_src, js_src)
+        try:
+            portfolio_html = build_portfolio_from_data(pdata)
+        except FileNotFoundError as e:
+            st.error(f"{Path(e.filename).name} not found at {e.filename}. Place it next to portfolio_builder.py.")
+            return
 
+        # Critical CSS inline, the rest and the script deferred
+        portfolio_html, report = optimize_portfolio_html(portfolio_html)
+        st.sidebar.caption(
+            f"Optimised HTML: {report['before_bytes']:,} → {report['after_bytes']:,} bytes "
+            f"({report['critical_css_bytes']:,} bytes of CSS inlined for first paint)"
+        )
         st.sidebar.download_button(
             label="Download HTML",
             data=portfolio_html,
             file_name="portfolio.html",
             mime="text/html"
         )
+        # Static site: index.html + hashed, precompressed assets for CDN/nginx hosting
+        site_zip = build_static_site_zip(
+            lambda css_href, js_href: build_portfolio_from_data(pdata, css_href=css_href, js_href=js_href)
+        )
+        st.sidebar.download_button(
+            label="Download static site (ZIP)",
+            data=site_zip,
+            file_name="portfolio_site.zip",
+            mime="application/zip"
+        )
 
 # ---------- Sections (keep as-is from your current code) ----------
+# Each section is a fragment: typing and clicking inside it reruns only that
+# section. Adding or removing entries still reruns the whole page.
 
+@fragment("portfolio_builder.personal_info")
 def personal_info_section():
     if "portfolio_data" not in st.session_state:
         st.session_state["portfolio_data"] = PortfolioData()
@@ -311,6 +341,7 @@ def personal_info_section():
         st.success("Personal information saved!")
 
 
+@fragment("portfolio_builder.about")
 def about_section():
     if "portfolio_data" not in st.session_state:
         st.session_state["portfolio_data"] = PortfolioData()
@@ -351,6 +382,7 @@ def about_section():
         st.success("About Me saved!")
 
 
+@fragment("portfolio_builder.experience")
 def experience_section():
     if "portfolio_data" not in st.session_state:
         st.session_state["portfolio_data"] = PortfolioData()
@@ -382,6 +414,7 @@ def experience_section():
                 st.rerun()
 
 
+@fragment("portfolio_builder.education")
 def education_section():
     if "portfolio_data" not in st.session_state:
         st.session_state["portfolio_data"] = PortfolioData()
@@ -411,6 +444,7 @@ def education_section():
                 st.rerun()
 
 
+@fragment("portfolio_builder.projects")
 def projects_section():
     if "portfolio_data" not in st.session_state:
         st.session_state["portfolio_data"] = PortfolioData()
@@ -442,6 +476,7 @@ def projects_section():
                 st.rerun()
 
 
+@fragment("portfolio_builder.contact")
 def contact_section():
     if "portfolio_data" not in st.session_state:
         st.session_state["portfolio_data"] = PortfolioData()
@@ -1,7 +1,13 @@
+import copy
+import hashlib
+import json
 import streamlit as st
 import streamlit.components.v1 as components
-from src.utils.resume_pdf_template import build_resume_pdf
-from io import BytesIO
+from src.utils.pdf_prerender import PDFPrerenderer
+from src.utils.streamlit_perf import fragment, show_rerun_stats, track_page
+
+# How often the export area checks on a background PDF render
+PDF_POLL_SECONDS = 1.0
 
 
 # Map Streamlit session data into the ReportLab PDF template schema
@@ -86,6 +92,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@track_page("resume_builder")
 def show():
     # Initialize session state
     if "resume_data" not in st.session_state:
@@ -120,33 +127,42 @@ def show():
     with tabs[6]: additional_info_section()
     with tabs[7]: preview_resume()
 
+    show_rerun_stats()
+
 
 # ---------------- SECTIONS ----------------
+# Each section is a fragment: its widgets rerun only that section. Changes
+# to resume_data end with a full st.rerun() so the Preview tab picks them up.
 
+@fragment("resume_builder.personal_info")
 def personal_info_section():
     st.markdown("### 📘 Personal Information")
     personal_info = st.session_state["resume_data"].get("personal_info", {})
 
-    col1, col2 = st.columns(2)
-    with col1:
-        name = st.text_input("Full Name", personal_info.get("name", ""))
-        role = st.text_input("Professional Role", personal_info.get("role", ""))
-        email = st.text_input("Email", personal_info.get("email", ""))
-        phone = st.text_input("Phone", personal_info.get("phone", ""))
-    with col2:
-        location = st.text_input("Location", personal_info.get("location", ""))
-        linkedin = st.text_input("LinkedIn URL", personal_info.get("linkedin", ""))
-        website = st.text_input("Portfolio Website", personal_info.get("website", ""))
-
-    summary = st.text_area("Professional Summary", personal_info.get("summary", ""), height=150)
-
-    st.session_state["resume_data"]["personal_info"] = {
-        "name": name, "role": role, "email": email, "phone": phone,
-        "location": location, "linkedin": linkedin, "website": website, "summary": summary
-    }
+    with st.form("resume_personal_info_form"):
+        col1, col2 = st.columns(2)
+        with col1:
+            name = st.text_input("Full Name", personal_info.get("name", ""))
+            role = st.text_input("Professional Role", personal_info.get("role", ""))
+            email = st.text_input("Email", personal_info.get("email", ""))
+            phone = st.text_input("Phone", personal_info.get("phone", ""))
+        with col2:
+            location = st.text_input("Location", personal_info.get("location", ""))
+            linkedin = st.text_input("LinkedIn URL", personal_info.get("linkedin", ""))
+            website = st.text_input("Portfolio Website", personal_info.get("website", ""))
+
+        summary = st.text_area("Professional Summary", personal_info.get("summary", ""), height=150)
+
+        if st.form_submit_button("Save Personal Information"):
+            st.session_state["resume_data"]["personal_info"] = {
+                "name": name, "role": role, "email": email, "phone": phone,
+                "location": location, "linkedin": linkedin, "website": website, "summary": summary
+            }
+            st.rerun()
     st.markdown("---")
 
 
+@fragment("resume_builder.education")
 def education_section():
     st.markdown("### 🎓 Education")
     if "education" not in st.session_state["resume_data"]:
@@ -181,6 +197,7 @@ def education_section():
     st.markdown("---")
 
 
+@fragment("resume_builder.experience")
 def experience_section():
     st.markdown("### 💼 Professional Experience")
     if "experience" not in st.session_state["resume_data"]:
@@ -215,6 +232,7 @@ def experience_section():
     st.markdown("---")
 
 
+@fragment("resume_builder.skills")
 def skills_section():
     st.markdown("### 🛠 Skills & Expertise")
     if "skills" not in st.session_state["resume_data"]:
@@ -242,6 +260,7 @@ def skills_section():
     st.markdown("---")
 
 
+@fragment("resume_builder.projects")
 def projects_section():
     st.markdown("### 📂 Projects")
     if "projects" not in st.session_state["resume_data"]:
@@ -276,6 +295,7 @@ def projects_section():
     st.markdown("---")
 
 
+@fragment("resume_builder.achievements")
 def achievements_section():
     st.markdown("### 🏆 Key Achievements")
     for i, achievement in enumerate(st.session_state["resume_data"]["achievements"]):
@@ -297,6 +317,7 @@ def achievements_section():
     st.markdown("---")
 
 
+@fragment("resume_builder.additional_info")
 def additional_info_section():
     st.markdown("### ℹ Additional Info")
     info_list = st.session_state["resume_data"].get("additional_info", [])
@@ -317,11 +338,7 @@ def additional_info_section():
 
 
 # ---------------- PREVIEW ----------------
-def preview_resume():
-    st.markdown("### 🖥 Resume Preview")
-    resume_state = st.session_state["resume_data"]
-    data = _map_resume_data_for_template(resume_state)
-
+def _build_preview_html(data: dict) -> str:
     # Build contact line (linkify only http/https)
     contact_bits = [x for x in [
         data.get("location"), data.get("email"), data.get("phone"),
@@ -428,20 +445,91 @@ def preview_resume():
       </div>
     </div>
     """
+    return html
+
+
+def resume_data_hash(resume_state: dict) -> str:
+    """Content hash of the session's resume data (key order independent)."""
+    canonical = json.dumps(resume_state, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+def _cached_preview(resume_state: dict):
+    """
+    Returns (data hash, mapped data, preview HTML) for the session's resume data.
+
+    Every widget change reruns the whole page and the Preview tab with it;
+    the mapping and HTML are only rebuilt when the resume data itself changed.
+    """
+    data_hash = resume_data_hash(resume_state)
+    cached = st.session_state.get("_resume_preview_cache")
+    if cached is None or cached["hash"] != data_hash:
+        # The mapping reuses some of the session's lists; copy it so the
+        # background render never sees a later edit half-way through
+        data = copy.deepcopy(_map_resume_data_for_template(resume_state))
+        cached = {"hash": data_hash, "data": data, "html": _build_preview_html(data)}
+        st.session_state["_resume_preview_cache"] = cached
+    return cached["hash"], cached["data"], cached["html"]
+
+
+def _get_prerenderer() -> PDFPrerenderer:
+    """This session's background PDF renderer (created on first use)."""
+    if "_pdf_prerenderer" not in st.session_state:
+        st.session_state["_pdf_prerenderer"] = PDFPrerenderer()
+    return st.session_state["_pdf_prerenderer"]
+
+
+def preview_resume():
+    st.markdown("### 🖥 Resume Preview")
+    data_hash, data, html = _cached_preview(st.session_state["resume_data"])
+
+    # Start (or keep) the PDF render for this exact data in the background;
+    # an edit since the last rerun cancels the stale one
+    prerenderer = _get_prerenderer()
+    prerenderer.request(data_hash, data)
 
     components.html(html, height=1200, scrolling=True)
 
-    # Export
     st.subheader("Export Resume")
-    if st.button("Download as PDF", key="btn_download_pdf"):
-        buf = BytesIO()
-        build_resume_pdf(buf, data)
-        buf.seek(0)
+    if prerenderer.status(data_hash) in ("pending", "rendering"):
+        _pdf_export_polling(data_hash, data)
+    else:
+        _pdf_export(data_hash, data)
+
+
+def _pdf_export_controls(data_hash: str, data: dict):
+    prerenderer = _get_prerenderer()
+    pdf_bytes = prerenderer.get(data_hash)
+    if pdf_bytes is None and st.button("Prepare PDF", key="btn_download_pdf"):
+        with st.spinner("Rendering PDF..."):
+            pdf_bytes = prerenderer.wait(data_hash, data)
+        if pdf_bytes is None:
+            st.error("The PDF could not be rendered. Please try again.")
+    if pdf_bytes is not None:
         st.download_button(
-            label="Click here to download PDF",
-            data=buf.read(),
+            label="Download as PDF",
+            data=pdf_bytes,
             file_name="resume.pdf",
             mime="application/pdf",
             key="btn_download_pdf_dl"
         )
+        from src.utils.resume_pdf_template import get_default_renderer  # loaded by the render already
+        stats = get_default_renderer().cache_stats()
+        st.caption(f"Section cache: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+
+
+@fragment("resume_builder.pdf_export")
+def _pdf_export(data_hash: str, data: dict):
+    _pdf_export_controls(data_hash, data)
+
+
+@fragment("resume_builder.pdf_export_polling", run_every=PDF_POLL_SECONDS)
+def _pdf_export_polling(data_hash: str, data: dict):
+    # Reruns by itself while the background render is queued or running, so
+    # the download button appears without a click. Once it settles, one full
+    # rerun swaps in the non-polling fragment and the timer stops
+    if _get_prerenderer().status(data_hash) not in ("pending", "rendering"):
+        st.rerun()
+    st.caption("Preparing the PDF in the background...")
+    _pdf_export_controls(data_hash, data)
 
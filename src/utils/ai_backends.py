@@ -0,0 +1,152 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from typing import Iterator, Protocol
+
+
+class BackendUnavailable(RuntimeError):
+    """The backend cannot serve requests at all (e.g. no API key)."""
+
+
+class AIBackend(Protocol):
+    """
+    What ai_utils and ai_batch need from a model. model_name is part of the
+    response cache key, so answers from different backends never mix.
+    Backends may also define `async agenerate(prompt)`; ai_batch uses it
+    instead of running generate on a thread.
+    """
+
+    model_name: str
+
+    def generate(self, prompt: str) -> str:
+        """The whole answer. Raises on failure."""
+        ...
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """The answer as text chunks, in order. Raises on failure."""
+        ...
+
+
+class GeminiBackend:
+    """
+    The shared Gemini model from ai_utils. Unlike generate_ai_content,
+    generate raises on failure so callers can decide whether to retry.
+    """
+
+    def __init__(self, model_name: str = None):
+        from src.utils import ai_utils
+        self.model_name = model_name or ai_utils.GEMINI_MODEL_NAME
+
+    def _model(self):
+        from src.utils.ai_utils import get_gemini_model
+        model = get_gemini_model()
+        if model is None:
+            raise BackendUnavailable("Gemini API not initialized. Check GEMINI_API_KEY.")
+        return model
+
+    def generate(self, prompt: str) -> str:
+        return self._model().generate_content(prompt).text
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        for chunk in self._model().generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+
+
+class StubBackend:
+    """
+    Local stand-in for a model, for load tests and benchmarks without
+    network access.
+
+    Each answer takes `latency` seconds, give or take up to `jitter`. The
+    delay and the answer text are derived from the prompt and `seed`, so a
+    run is reproducible whatever order the prompts are sent in. stream()
+    yields the answer word by word, the first word after `first_chunk`
+    of the delay.
+    """
+
+    model_name = "stub"
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.0, seed: int = 0,
+                 first_chunk: float = 0.2, words: int = 40):
+        self.latency = latency
+        self.jitter = jitter
+        self.seed = seed
+        self.first_chunk = first_chunk
+        self.words = words
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _rng(self, prompt: str) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}\0{prompt}".encode("utf-8")).digest()
+        return random.Random(digest)
+
+    def _plan(self, prompt: str):
+        """(delay in seconds, answer words) for prompt."""
+        with self._lock:
+            self.calls += 1
+        rng = self._rng(prompt)
+        delay = max(0.0, self.latency + rng.uniform(-self.jitter, self.jitter))
+        vocabulary = prompt.split() or ["stub"]
+        words = [rng.choice(vocabulary) for _ in range(self.words)]
+        return delay, words
+
+    def generate(self, prompt: str) -> str:
+        delay, words = self._plan(prompt)
+        time.sleep(delay)
+        return " ".join(words)
+
+    async def agenerate(self, prompt: str) -> str:
+        import asyncio  # only batch callers need it; keeps ai_utils cheap to import
+        delay, words = self._plan(prompt)
+        await asyncio.sleep(delay)
+        return " ".join(words)
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        delay, words = self._plan(prompt)
+        time.sleep(delay * self.first_chunk)
+        step = delay * (1 - self.first_chunk) / max(1, len(words) - 1)
+        for i, word in enumerate(words):
+            if i:
+                time.sleep(step)
+            yield word if i == 0 else f" {word}"
+
+
+def backend_from_config(name: str = None) -> AIBackend:
+    """
+    Builds the backend named by AI_BACKEND ('gemini', the default, or 'stub').
+    The stub reads AI_STUB_LATENCY, AI_STUB_JITTER and AI_STUB_SEED.
+    """
+    name = (name or os.environ.get("AI_BACKEND", "gemini")).lower()
+    if name == "gemini":
+        return GeminiBackend()
+    if name == "stub":
+        return StubBackend(
+            latency=float(os.environ.get("AI_STUB_LATENCY", 0.5)),
+            jitter=float(os.environ.get("AI_STUB_JITTER", 0.0)),
+            seed=int(os.environ.get("AI_STUB_SEED", 0)),
+        )
+    raise ValueError(f"Unknown AI_BACKEND '{name}' (expected 'gemini' or 'stub')")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> AIBackend:
+    """Process-wide backend chosen by backend_from_config on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = backend_from_config()
+    return _backend
+
+
+def set_backend(backend: AIBackend):
+    """Replaces the process-wide backend (benchmarks, load tests)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
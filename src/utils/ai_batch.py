@@ -0,0 +1,99 @@
+import asyncio
+import collections
+import logging
+import random
+import time
+from src.utils.ai_backends import BackendUnavailable, get_backend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 1.0
+
+
+class RequestsPerMinuteLimiter:
+    """
+    Async limiter allowing at most `rpm` acquisitions in any 60 second window.
+    Retries count against the budget like any other request.
+    """
+
+    def __init__(self, rpm: int, window: float = 60.0):
+        self.rpm = rpm
+        self.window = window
+        self._sent = collections.deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._sent and self._sent[0] <= now - self.window:
+                    self._sent.popleft()
+                if len(self._sent) < self.rpm:
+                    self._sent.append(now)
+                    return
+                await asyncio.sleep(self._sent[0] + self.window - now)
+
+
+async def _call_backend(backend, prompt: str) -> str:
+    agenerate = getattr(backend, "agenerate", None)
+    if agenerate is not None:
+        return await agenerate(prompt)
+    # Blocking SDKs run on the default thread pool so prompts still overlap
+    return await asyncio.to_thread(backend.generate, prompt)
+
+
+async def agenerate_batch(prompts, backend=None, concurrency: int = DEFAULT_CONCURRENCY,
+                          rpm: int = DEFAULT_REQUESTS_PER_MINUTE, retries: int = DEFAULT_RETRIES,
+                          backoff: float = DEFAULT_BACKOFF_SECONDS):
+    """
+    Runs every prompt through backend concurrently and returns the answers
+    in input order.
+
+    At most `concurrency` requests are in flight and at most `rpm` are sent
+    per minute. A failed request is retried up to `retries` times, waiting
+    backoff * 2**attempt seconds plus up to `backoff` of random jitter; an
+    unavailable backend is not retried. A prompt that still fails yields an
+    error string, as generate_ai_content does, instead of failing the batch.
+    backend defaults to ai_backends.get_backend().
+    """
+    if backend is None:
+        backend = get_backend()
+    prompts = list(prompts)
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RequestsPerMinuteLimiter(rpm) if rpm else None
+    retried = 0
+
+    async def run_one(prompt: str) -> str:
+        nonlocal retried
+        for attempt in range(retries + 1):
+            async with semaphore:
+                if limiter is not None:
+                    await limiter.acquire()
+                try:
+                    return await _call_backend(backend, prompt)
+                except BackendUnavailable as e:
+                    return f"Error: {e}"  # retrying cannot help
+                except Exception as e:
+                    if attempt == retries:
+                        logger.error(f"Error generating AI content after {attempt + 1} attempts: {e}")
+                        return f"Error generating AI content: {e}"
+                    logger.warning(f"AI request failed (attempt {attempt + 1}), retrying: {e}")
+            # Back off outside the semaphore so other prompts can use the slot
+            retried += 1
+            await asyncio.sleep(backoff * 2 ** attempt + random.uniform(0, backoff))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_one(prompt) for prompt in prompts))
+    logger.info(
+        f"AI batch: {len(prompts)} prompts in {time.perf_counter() - start:.2f}s "
+        f"({retried} retries, concurrency {concurrency}, {rpm or 'unlimited'} rpm)"
+    )
+    return results
+
+
+def generate_batch(prompts, backend=None, **kwargs):
+    """Blocking wrapper around agenerate_batch, for Streamlit pages and scripts."""
+    return asyncio.run(agenerate_batch(prompts, backend=backend, **kwargs))
@@ -0,0 +1,149 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from src.utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+def ai_cache_key(model_name: str, prompt: str) -> str:
+    """SHA-256 over the model name and the exact prompt text."""
+    digest = hashlib.sha256()
+    digest.update(model_name.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _entry_size(entry) -> int:
+    """Bytes of the response text in a memory-tier (expires_at, text) entry."""
+    return len(entry[1].encode("utf-8"))
+
+
+class AIResponseCache:
+    """
+    Two-tier cache for model responses.
+
+    The memory tier is an LRU of (expires_at, text) bounded by the total
+    size of the response text and by entry count.
+    The persistent tier is a SQLite file shared by every process using the
+    same path; once it holds more than `disk_max_entries` rows the least
+    recently read ones are deleted. Every entry expires `ttl` seconds after
+    it was stored, in both tiers. Disk hits are promoted into memory.
+    """
+
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL_SECONDS,
+                 memory_max_bytes: int = 8 * 1024 * 1024, memory_max_entries: int = 512,
+                 disk_max_entries: int = 10000):
+        self.path = path
+        self.ttl = ttl
+        self.disk_max_entries = disk_max_entries
+        self._memory = LRUCache(max_entries=memory_max_entries, max_bytes=memory_max_bytes, sizeof=_entry_size)
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.disk_evictions = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, response TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+
+    def get(self, key: str):
+        """Returns (text, tier) where tier is 'memory', 'disk' or None on a miss."""
+        now = time.time()
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, text = entry
+            if expires_at > now:
+                with self._lock:
+                    self.memory_hits += 1
+                return text, "memory"
+            self._memory.pop(key)
+
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.warning(f"AI cache read failed: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None, None
+            if row[1] <= now:
+                self.expired += 1
+                self.misses += 1
+                return None, None
+            self.disk_hits += 1
+        self._memory.put(key, (row[1], row[0]))
+        return row[0], "disk"
+
+    def put(self, key: str, text: str):
+        now = time.time()
+        expires_at = now + self.ttl
+        self._memory.put(key, (expires_at, text))
+        try:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, text, expires_at, now),
+                )
+                self._evict(now)
+        except sqlite3.Error as e:
+            logger.warning(f"AI cache write failed: {e}")
+
+    def _evict(self, now: float):
+        # Caller holds self._lock
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        excess = count - self.disk_max_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN"
+                " (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            self.disk_evictions += excess
+
+    def clear(self):
+        self._memory.clear()
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        memory = self._memory.stats()
+        with self._lock:
+            (disk_entries,) = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "hits": self.memory_hits + self.disk_hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory_entries": memory["entries"],
+                "memory_bytes": memory["bytes"],
+                "memory_evictions": memory["evictions"],
+                "disk_entries": disk_entries,
+                "disk_evictions": self.disk_evictions,
+            }
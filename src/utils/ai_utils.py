@@ -1,46 +1,213 @@
+import logging
 import os
-import google.generativeai as genai
-import requests
+import threading
+import time
+from pathlib import Path
+from src.utils.ai_backends import BackendUnavailable, get_backend
+from src.utils.ai_cache import DEFAULT_TTL_SECONDS, AIResponseCache, ai_cache_key
+from src.utils.single_flight import SingleFlight
 
+logger = logging.getLogger(__name__)
 
+GEMINI_MODEL_NAME = 'gemini-2.5-pro'
 
-# Initialize the Gemini model once when the module is loaded
+# Response cache: set AI_CACHE_PATH to move the SQLite file, AI_CACHE_TTL_SECONDS
+# to change how long answers are reused, or AI_CACHE_TTL_SECONDS=0 to disable it
+AI_CACHE_PATH = os.environ.get(
+    "AI_CACHE_PATH", str(Path(__file__).resolve().parents[2] / "instance" / "ai_cache.sqlite3")
+)
+AI_CACHE_TTL_SECONDS = float(os.environ.get("AI_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+
+# The Gemini SDK is imported and configured on first use, not when this
+# module is imported; processes that never generate content never load it
 _gemini_model = None
+_gemini_init_error = None
+_gemini_init_done = False
+_gemini_init_lock = threading.Lock()
+
 
 def _initialize_gemini_model():
     """Initializes the Gemini API client and model."""
-    global _gemini_model
-    if _gemini_model is None:
-        try:
-            api_key = os.environ.get("GEMINI_API_KEY")
-            if not api_key:
-                raise ValueError("GEMINI_API_KEY environment variable not set.")
-            genai.configure(api_key=api_key)
-            _gemini_model = genai.GenerativeModel('gemini-2.5-pro')
-        except Exception as e:
-            print(f"Error initializing Gemini API: {e}")
-            _gemini_model = None # Ensure it's None if initialization fails
+    global _gemini_model, _gemini_init_error
+    try:
+        api_key = os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY environment variable not set.")
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        _gemini_model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    except Exception as e:
+        logger.error(f"Error initializing Gemini API: {e}")
+        _gemini_init_error = e
+        _gemini_model = None # Ensure it's None if initialization fails
 
-_initialize_gemini_model() # Call initialization when the module loads
 
-def generate_ai_content(prompt: str) -> str:
+def get_gemini_model():
+    """
+    Returns the shared Gemini model, initialising it on the first call.
+
+    Thread-safe: concurrent first callers wait for a single initialisation.
+    A failed initialisation is not retried; None is returned from then on.
+    """
+    global _gemini_init_done
+    if not _gemini_init_done:
+        with _gemini_init_lock:
+            if not _gemini_init_done:
+                _initialize_gemini_model()
+                _gemini_init_done = True
+    return _gemini_model
+
+
+def warm_up_in_background() -> threading.Thread:
+    """
+    Starts initialising the Gemini client on a daemon thread, so the SDK
+    import and configuration are done before the first prompt arrives.
     """
-    Generates content using the Gemini AI model.
+    thread = threading.Thread(target=get_gemini_model, name="gemini-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+_ai_cache = None
+_ai_cache_lock = threading.Lock()
+
+
+def get_ai_cache():
+    """Process-wide response cache, or None when disabled or the file cannot be opened."""
+    global _ai_cache
+    if _ai_cache is None and AI_CACHE_TTL_SECONDS > 0:
+        with _ai_cache_lock:
+            if _ai_cache is None:
+                try:
+                    _ai_cache = AIResponseCache(AI_CACHE_PATH, ttl=AI_CACHE_TTL_SECONDS)
+                except Exception as e:
+                    logger.error(f"AI response cache disabled: {e}")
+                    _ai_cache = False
+    return _ai_cache or None
+
+
+# Identical prompts already on their way to the model are sent once
+_single_flight = SingleFlight()
+
+
+def single_flight_stats() -> dict:
+    """How many generate_ai_content calls shared another caller's in-flight request."""
+    return _single_flight.stats()
+
+
+def _generate_and_cache(backend, prompt: str, key: str, cache) -> str:
+    try:
+        text = backend.generate(prompt)
+    except BackendUnavailable as e:
+        return f"Error: {e}"
+    except Exception as e:
+        logger.error(f"Error generating AI content: {e}")
+        return f"Error generating AI content: {e}"
+    # Stored before waiting callers are released, so a caller arriving just
+    # after the request finished finds it in the cache instead
+    if cache is not None:
+        cache.put(key, text)
+    return text
+
+
+def generate_ai_content(prompt: str, use_cache: bool = True) -> str:
+    """
+    Generates content using the configured AI backend (Gemini unless
+    AI_BACKEND says otherwise, see ai_backends.backend_from_config).
 
     Args:
         prompt: The text prompt to send to the AI.
+        use_cache: Reuse an earlier answer to the same prompt while it is
+            within AI_CACHE_TTL_SECONDS, or share the answer of a request
+            for the same prompt that is already running on another thread.
+            Error messages are never cached.
 
     Returns:
         The generated text content from the AI, or an error message if something goes wrong.
     """
-    if _gemini_model is None:
-        return "Error: Gemini API not initialized. Check GEMINI_API_KEY."
+    backend = get_backend()
+    key = ai_cache_key(backend.model_name, prompt)
+    if not use_cache:
+        return _generate_and_cache(backend, prompt, key, None)
 
-    try:
-        response = _gemini_model.generate_content(prompt)
-        return response.text
-    except Exception as e:
-        return f"Error generating AI content: {e}"
+    cache = get_ai_cache()
+    if cache is not None:
+        text, _ = cache.get(key)
+        if text is not None:
+            return text
+    return _single_flight.do(key, lambda: _generate_and_cache(backend, prompt, key, cache))
+
+
+class AIContentStream:
+    """
+    Iterable of text chunks for one prompt, yielded as the model produces them.
+
+    Pass it to st.write_stream to render the answer progressively. Once
+    iteration has finished, `text` holds the whole answer and
+    `time_to_first_chunk` / `total_time` the timings in seconds (both
+    measured from the start of iteration). An answer already in the cache
+    is yielded as a single chunk; a complete streamed answer is cached.
+    """
+
+    def __init__(self, prompt: str, use_cache: bool = True):
+        self.prompt = prompt
+        self.use_cache = use_cache
+        self.text = None
+        self.time_to_first_chunk = None
+        self.total_time = None
+        self.from_cache = False
+
+    def _chunks(self):
+        backend = get_backend()
+        cache = get_ai_cache() if self.use_cache else None
+        key = ai_cache_key(backend.model_name, self.prompt)
+        if cache is not None:
+            text, _ = cache.get(key)
+            if text is not None:
+                self.from_cache = True
+                yield text
+                return
+
+        parts = []
+        try:
+            for chunk in backend.stream(self.prompt):
+                parts.append(chunk)
+                yield chunk
+        except BackendUnavailable as e:
+            yield f"Error: {e}"
+            return
+        except Exception as e:
+            logger.error(f"Error generating AI content: {e}")
+            yield f"Error generating AI content: {e}"
+            return
+        if cache is not None:
+            cache.put(key, "".join(parts))
+
+    def __iter__(self):
+        start = time.perf_counter()
+        parts = []
+        for chunk in self._chunks():
+            if self.time_to_first_chunk is None:
+                self.time_to_first_chunk = time.perf_counter() - start
+            parts.append(chunk)
+            yield chunk
+        self.total_time = time.perf_counter() - start
+        self.text = "".join(parts)
+        logger.info(
+            f"AI stream: first chunk after {self.time_to_first_chunk or 0:.2f}s, "
+            f"done in {self.total_time:.2f}s ({len(self.text)} chars{', cached' if self.from_cache else ''})"
+        )
+
+
+def stream_ai_content(prompt: str, use_cache: bool = True) -> AIContentStream:
+    """
+    Streaming counterpart of generate_ai_content, e.g.
+
+        stream = stream_ai_content(prompt)
+        st.write_stream(stream)
+        st.caption(f"First words after {stream.time_to_first_chunk:.1f}s")
+    """
+    return AIContentStream(prompt, use_cache=use_cache)
 
 if __name__ == '__main__':
     # Example usage (this will only run if you execute ai_utils.py directly)
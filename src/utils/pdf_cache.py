@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from src.utils.lru_cache import LRUCache
+
+
+def payload_cache_key(payload: dict, template_version: str) -> str:
+    """
+    Content address for a rendered PDF: a SHA-256 over the canonical JSON form
+    of the validated payload (sorted keys, no insignificant whitespace) and the
+    template version, so key order or formatting differences in the request
+    body never cause a re-render.
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    digest = hashlib.sha256()
+    digest.update(template_version.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(canonical.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class PDFRenderCache:
+    """
+    Two-tier cache for rendered PDF bytes.
+
+    The memory tier is an LRU bounded by total bytes. The disk tier stores one
+    file per key under `directory` and evicts the least recently used files
+    once their combined size passes `disk_max_bytes`. Disk hits are promoted
+    into the memory tier.
+    """
+
+    def __init__(self, directory: str, memory_max_bytes: int = 32 * 1024 * 1024,
+                 disk_max_bytes: int = 512 * 1024 * 1024, memory_max_entries: int = 256):
+        self.directory = directory
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = LRUCache(max_entries=memory_max_entries, max_bytes=memory_max_bytes)
+        self._disk_index = OrderedDict()  # key -> size, least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_disk_index()
+
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def _load_disk_index(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".pdf"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, name[:-4], st.st_size))
+        for _, key, size in sorted(entries):
+            self._disk_index[key] = size
+            self._disk_bytes += size
+
+    def get(self, key: str):
+        """Returns (pdf_bytes, tier) where tier is 'memory', 'disk' or None on a miss."""
+        pdf_bytes = self._memory.get(key)
+        if pdf_bytes is not None:
+            with self._lock:
+                self.memory_hits += 1
+            return pdf_bytes, "memory"
+
+        path = self._path_for(key)
+        try:
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                # Another process may have evicted it; drop our stale index entry
+                if key in self._disk_index:
+                    self._disk_bytes -= self._disk_index.pop(key)
+            return None, None
+
+        try:
+            os.utime(path)  # keep eviction order meaningful across restarts
+        except OSError:
+            pass
+        with self._lock:
+            self.disk_hits += 1
+            if key in self._disk_index:
+                self._disk_index.move_to_end(key)
+        self._memory.put(key, pdf_bytes)
+        return pdf_bytes, "disk"
+
+    def put(self, key: str, pdf_bytes: bytes):
+        self._memory.put(key, pdf_bytes)
+        if len(pdf_bytes) > self.disk_max_bytes:
+            return
+
+        # Write atomically so concurrent readers never see a partial PDF
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, self._path_for(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self._lock:
+            if key in self._disk_index:
+                self._disk_bytes -= self._disk_index.pop(key)
+            self._disk_index[key] = len(pdf_bytes)
+            self._disk_bytes += len(pdf_bytes)
+            while self._disk_bytes > self.disk_max_bytes and self._disk_index:
+                old_key, old_size = self._disk_index.popitem(last=False)
+                self._disk_bytes -= old_size
+                self.disk_evictions += 1
+                try:
+                    os.remove(self._path_for(old_key))
+                except FileNotFoundError:
+                    pass
+
+    def get_or_render(self, key: str, render):
+        """Returns (pdf_bytes, tier), calling render() to produce the bytes on a miss."""
+        pdf_bytes, tier = self.get(key)
+        if pdf_bytes is not None:
+            return pdf_bytes, tier
+        pdf_bytes = render()
+        self.put(key, pdf_bytes)
+        return pdf_bytes, None
+
+    def stats(self) -> dict:
+        memory = self._memory.stats()
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "hits": self.memory_hits + self.disk_hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "memory_entries": memory["entries"],
+                "memory_bytes": memory["bytes"],
+                "memory_evictions": memory["evictions"],
+                "disk_entries": len(self._disk_index),
+                "disk_bytes": self._disk_bytes,
+                "disk_evictions": self.disk_evictions,
+            }
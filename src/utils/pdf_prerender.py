@@ -0,0 +1,132 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Quiet period after the last edit before a render starts
+DEBOUNCE_SECONDS = 1.5
+# A worker with nothing to do for this long exits; the next request starts a new one
+IDLE_EXIT_SECONDS = 60.0
+
+
+def _render_with_default_renderer(data, cancel_event):
+    from src.utils.resume_pdf_template import get_default_renderer
+    return get_default_renderer().render_to_bytes(data, cancel_event=cancel_event)
+
+
+class PDFPrerenderer:
+    """
+    Renders one session's resume PDF in the background once its data settles.
+
+    request(key, data) is called on every rerun with the current content hash.
+    The render starts after `debounce` seconds without a newer request; a
+    request for different data cancels a render in flight (ReportLab stops at
+    the next flowable) and drops one that has not started yet. Only the PDF
+    for the latest key is kept.
+    """
+
+    def __init__(self, render=_render_with_default_renderer, debounce: float = DEBOUNCE_SECONDS,
+                 idle_exit: float = IDLE_EXIT_SECONDS):
+        self._render = render
+        self.debounce = debounce
+        self.idle_exit = idle_exit
+        self._cond = threading.Condition()
+        self._pending = None  # (key, data, due time)
+        self._running_key = None
+        self._running_cancel = None
+        self._ready_key = None
+        self._ready_bytes = None
+        self._worker = None
+        self.renders = 0
+        self.cancelled = 0
+
+    def request(self, key: str, data, immediate: bool = False):
+        """Schedules a render of data unless the PDF for key is ready or already rendering."""
+        with self._cond:
+            cancel = self._running_cancel
+            if key == self._ready_key or (key == self._running_key and not cancel.is_set()):
+                self._pending = None
+                return
+            if cancel is not None:
+                cancel.set()
+            due = time.monotonic() + (0 if immediate else self.debounce)
+            if self._pending is not None and self._pending[0] == key:
+                due = min(due, self._pending[2])
+            self._pending = (key, data, due)
+            self._cond.notify_all()
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="pdf-prerender", daemon=True)
+                self._worker.start()
+
+    def get(self, key: str):
+        """The finished PDF for key, or None if it is not ready (yet)."""
+        with self._cond:
+            return self._ready_bytes if self._ready_key == key else None
+
+    def status(self, key: str) -> str:
+        with self._cond:
+            if self._ready_key == key:
+                return "ready"
+            if self._running_key == key:
+                return "rendering"
+            if self._pending is not None and self._pending[0] == key:
+                return "pending"
+            return "idle"
+
+    def wait(self, key: str, data, timeout: float = None):
+        """
+        Returns the PDF for key, skipping the debounce and waiting for the
+        render to finish. None if it did not finish within timeout.
+        """
+        self.request(key, data, immediate=True)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._ready_key != key:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                if self._running_key != key and (self._pending is None or self._pending[0] != key):
+                    return None  # superseded by a newer request, or the render failed
+                self._cond.wait(remaining)
+            return self._ready_bytes
+
+    def _run(self):
+        # ReportLab is first imported here, on the worker, not with the page
+        from src.utils.resume_pdf_template import RenderCancelled
+
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending is None:
+                        if not self._cond.wait(self.idle_exit) and self._pending is None:
+                            self._worker = None
+                            return
+                        continue
+                    delay = self._pending[2] - time.monotonic()
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                key, data, _ = self._pending
+                self._pending = None
+                self._running_key = key
+                self._running_cancel = cancel_event = threading.Event()
+
+            pdf_bytes = None
+            started = time.perf_counter()
+            try:
+                pdf_bytes = self._render(data, cancel_event)
+            except RenderCancelled:
+                self.cancelled += 1
+                logger.debug(f"Stale PDF pre-render cancelled ({key[:8]})")
+            except Exception as e:
+                logger.error(f"PDF pre-render failed: {e}")
+
+            with self._cond:
+                if pdf_bytes is not None and not cancel_event.is_set():
+                    self._ready_key, self._ready_bytes = key, pdf_bytes
+                    self.renders += 1
+                    logger.debug(f"PDF pre-rendered in {time.perf_counter() - started:.2f}s ({key[:8]})")
+                self._running_key = None
+                self._running_cancel = None
+                self._cond.notify_all()
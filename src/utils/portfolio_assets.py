@@ -0,0 +1,82 @@
+import hashlib
+import re
+from functools import partial
+from pathlib import Path
+from src.utils.reloading_file import ReloadingFile
+
+ASSET_DIR = Path(__file__).resolve().parent.parent / "pages"
+CSS_PATH = ASSET_DIR / "portfolio.css"
+JS_PATH = ASSET_DIR / "portfolio.js"
+
+# String literals are copied through untouched by both minifiers
+_CSS_TOKENS = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)""", re.DOTALL)
+_JS_TOKENS = re.compile(r"""("(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)|(/\*.*?\*/|//[^\n]*)""", re.DOTALL)
+
+
+def _minify_css_code(code: str) -> str:
+    code = re.sub(r"\s+", " ", code)
+    # Spaces before ':' are left alone: in a selector they separate a
+    # descendant from a pseudo-class
+    code = re.sub(r"\s*([{};,>])\s*", r"\1", code)
+    code = re.sub(r":\s+", ":", code)
+    return code.replace(";}", "}")
+
+
+def minify_css(source: str) -> str:
+    """Drops comments and insignificant whitespace from a stylesheet."""
+    out = []
+    position = 0
+    for match in _CSS_TOKENS.finditer(source):
+        out.append(_minify_css_code(source[position:match.start()]))
+        if match.group(1):
+            out.append(match.group(1))
+        position = match.end()
+    out.append(_minify_css_code(source[position:]))
+    return "".join(out).strip()
+
+
+def minify_js(source: str) -> str:
+    """
+    Drops comments, indentation and blank lines from a script.
+
+    Line breaks are kept so automatic semicolon insertion still behaves the
+    same. Regular expression literals are not recognised, so scripts using
+    '//' or '/*' inside one should not go through this.
+    """
+    out = []
+    position = 0
+    for match in _JS_TOKENS.finditer(source):
+        out.append(source[position:match.start()])
+        out.append(match.group(1) or "")
+        position = match.end()
+    out.append(source[position:])
+    lines = (line.strip() for line in "".join(out).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class StaticAsset:
+    """A portfolio asset loaded once, minified, and fingerprinted by content."""
+
+    def __init__(self, path: Path, minify, source: str):
+        self.path = path
+        self.source = source
+        self.content = minify(source)
+        self.fingerprint = hashlib.sha256(self.content.encode("utf-8")).hexdigest()[:12]
+
+    @property
+    def hashed_name(self) -> str:
+        """e.g. portfolio.3f2a9c01b7de.css, safe to serve with a long cache lifetime."""
+        return f"{self.path.stem}.{self.fingerprint}{self.path.suffix}"
+
+
+# Shared by every Streamlit session in the process; reloaded when a file changes
+_css = ReloadingFile(CSS_PATH, partial(StaticAsset, CSS_PATH, minify_css))
+_js = ReloadingFile(JS_PATH, partial(StaticAsset, JS_PATH, minify_js))
+
+
+def get_portfolio_css() -> StaticAsset:
+    return _css.get()
+
+
+def get_portfolio_js() -> StaticAsset:
+    return _js.get()
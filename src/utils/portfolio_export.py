@@ -0,0 +1,56 @@
+import gzip
+import zipfile
+from src.utils.portfolio_assets import get_portfolio_css, get_portfolio_js
+from src.utils.portfolio_optimize import optimize_portfolio_html
+from src.utils.zip_stream import ZipStreamWriter
+
+try:
+    import brotli
+except ImportError:  # optional: .br copies are skipped without it
+    brotli = None
+
+
+def _precompressed(data: bytes):
+    """Yields (suffix, bytes) for every precompressed variant we can produce."""
+    # mtime=0 keeps the .gz output identical for identical input
+    yield ".gz", gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", brotli.compress(data, quality=11)
+
+
+def iter_static_site_zip(render_index):
+    """
+    Yields a ZIP archive of the portfolio as a static site, chunk by chunk.
+
+    render_index(css_href, js_href) must return the page HTML linking the
+    given asset names. The archive contains index.html, the content-hashed
+    portfolio.<hash>.css / portfolio.<hash>.js, and .gz (plus .br when the
+    brotli package is installed) copies of each, ready for nginx
+    gzip_static/brotli_static or a CDN. The hashed assets can be served with
+    a long, immutable cache lifetime; index.html should be revalidated.
+    index.html gets the critical-CSS / deferred-JS pass.
+    """
+    css = get_portfolio_css()
+    js = get_portfolio_js()
+    index_html, _ = optimize_portfolio_html(
+        render_index(css.hashed_name, js.hashed_name), css_href=css.hashed_name, css_src=css.content
+    )
+    files = [
+        ("index.html", index_html),
+        (css.hashed_name, css.content),
+        (js.hashed_name, js.content),
+    ]
+
+    writer = ZipStreamWriter()
+    for name, text in files:
+        data = text.encode("utf-8")
+        yield writer.add(name, data)
+        for suffix, compressed in _precompressed(data):
+            # Already compressed; deflating again would only cost CPU
+            yield writer.add(name + suffix, compressed, compress_type=zipfile.ZIP_STORED)
+    yield writer.close()
+
+
+def build_static_site_zip(render_index) -> bytes:
+    """The whole archive from iter_static_site_zip as bytes (for download buttons)."""
+    return b"".join(iter_static_site_zip(render_index))
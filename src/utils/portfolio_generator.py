@@ -1,40 +1,34 @@
-import os
+import re
 from pathlib import Path
-from typing import List
-from dataclasses import asdict
 from src.data.portfolio_data import PortfolioData
+from src.utils.portfolio_assets import get_portfolio_css, get_portfolio_js
+from src.utils.reloading_file import ReloadingFile
 
+# Path to your HTML template
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "pages" / "portfolio.html"
 
-def generate_portfolio_html(portfolio_data: PortfolioData) -> str:
-    """
-    Generates a complete HTML portfolio by injecting user data
-    into the provided portfolio.html template.
-    """
+# <!-- slot:name -->placeholder content<!-- /slot -->
+# The placeholder keeps portfolio.html previewable on its own; it is dropped
+# when the template is compiled.
+_SLOT_PATTERN = re.compile(r"<!--\s*slot:(\w+)\s*-->.*?<!--\s*/slot\s*-->", re.DOTALL)
+
+
+# ---- Slot renderers: each returns the HTML fragment for one insertion point ----
 
-    # Path to your HTML template
-    template_path = Path(__file__).resolve().parent.parent / "pages" / "portfolio.html"
-    css_path = "portfolio.css"
-    js_path = "portfolio.js"
+def _render_name(portfolio_data: PortfolioData) -> str:
+    return portfolio_data.personal_info.name or "Your Name"
 
-    # Read the existing HTML template
-    if not template_path.exists():
-        raise FileNotFoundError(f"Portfolio template not found at {template_path}")
-    html = template_path.read_text(encoding="utf-8")
 
-    # Replace static placeholders with user data
+def _render_hero(portfolio_data: PortfolioData) -> str:
     personal = portfolio_data.personal_info
-    about = portfolio_data.about_me
-    education = portfolio_data.education
-    experience = portfolio_data.experience
-    contact = portfolio_data.contact
-    projects = portfolio_data.projects
+    return (
+        f"<h1>Hello, I'm {personal.name or 'Your Name'}</h1>\n"
+        f"                <p>A Passionate {personal.role or 'Your Profession'}</p>"
+    )
 
-    # ---- Replace Main Hero Section ----
-    html = html.replace("Your Name", personal.name or "Your Name")
-    html = html.replace("[Your Name]", personal.name or "Your Name")
-    html = html.replace("[Your Profession, e.g., Web Developer]", personal.role or "Your Profession")
 
-    # ---- About Me ----
+def _render_about(portfolio_data: PortfolioData) -> str:
+    about = portfolio_data.about_me
     bio_html = about.biography or "Welcome to my portfolio!"
     skills_html = ""
     if about.skills:
@@ -42,41 +36,24 @@ def generate_portfolio_html(portfolio_data: PortfolioData) -> str:
         for skill in about.skills:
             skills_html += f"<li>{skill.name}</li>"
         skills_html += "</ul>"
+    return f"<p>{bio_html}</p>{skills_html}"
 
-    html = html.replace(
-        "Replace this text with a brief but engaging summary about yourself, your skills, and what drives you. "
-        "Mention your key areas of expertise and what you're looking for in your career.",
-        f"{bio_html}{skills_html}"
-    )
 
-    # ---- Education ----
+def _render_education(portfolio_data: PortfolioData) -> str:
     edu_html = ""
-    for edu in education:
+    for edu in portfolio_data.education:
         edu_html += f"""
         <div class="timeline-item">
             <h3>{edu.degree}</h3>
             <h4>{edu.institution} | {edu.years}</h4>
         </div>
         """
-    html = html.replace(
-        """<div class="timeline">
-                    <div class="timeline-item">
-                        <h3>Master's Degree in Computer Science</h3>
-                        <h4>University Name | 2022 - 2024</h4>
-                        <p>Focused on advanced algorithms, machine learning, and software architecture. Completed a thesis on [Your Thesis Topic].</p>
-                    </div>
-                    <div class="timeline-item">
-                        <h3>Bachelor's Degree in Information Technology</h3>
-                        <h4>Another University Name | 2018 - 2022</h4>
-                        <p>Gained a strong foundation in programming, database management, and web development. Graduated with honors.</p>
-                    </div>
-                </div>""",
-        f"<div class='timeline'>{edu_html}</div>"
-    )
+    return f"<div class='timeline'>{edu_html}</div>"
+
 
-    # ---- Experience ----
+def _render_experience(portfolio_data: PortfolioData) -> str:
     exp_html = ""
-    for exp in experience:
+    for exp in portfolio_data.experience:
         exp_html += f"""
         <div class="timeline-item">
             <h3>{exp.role}</h3>
@@ -84,36 +61,26 @@ def generate_portfolio_html(portfolio_data: PortfolioData) -> str:
             <p>{exp.description}</p>
         </div>
         """
-    html = html.replace(
-        """<div class="timeline">
-                    <div class="timeline-item">
-                        <h3>Senior Software Engineer</h3>
-                        <h4>Tech Company Inc. | 2024 - Present</h4>
-                        <p>Lead developer on the main product team. Responsible for architecting new features, mentoring junior developers, and improving system performance by 20%.</p>
-                    </div>
-                    <div class="timeline-item">
-                        <h3>Junior Web Developer</h3>
-                        <h4>Creative Agency | 2022 - 2024</h4>
-                        <p>Developed and maintained client websites using HTML, CSS, JavaScript, and Python/Django. Collaborated with designers to create responsive and user-friendly interfaces.</p>
-                    </div>
-                </div>""",
-        f"<div class='timeline'>{exp_html}</div>"
-    )
+    return f"<div class='timeline'>{exp_html}</div>"
 
-    # ---- Projects Section ----
-    if projects:
-        proj_html = ""
-        for proj in projects:
-            proj_html += f"""
+
+def _render_projects(portfolio_data: PortfolioData) -> str:
+    if not portfolio_data.projects:
+        return ""
+    proj_html = ""
+    for proj in portfolio_data.projects:
+        proj_html += f"""
             <div class="timeline-item">
                 <h3>{proj.title}</h3>
                 <p>{proj.description}</p>
                 {'<a href="' + proj.link + '" target="_blank">View Project</a>' if proj.link else ''}
             </div>
             """
-        html = html.replace("</section>\n\n        <section id=\"contact\">", f"<div class='timeline'>{proj_html}</div>\n</section>\n\n        <section id=\"contact\">")
+    return f"<div class='timeline'>{proj_html}</div>"
+
 
-    # ---- Contact Info ----
+def _render_contact(portfolio_data: PortfolioData) -> str:
+    contact = portfolio_data.contact
     contact_links = ""
     if contact.linkedin:
         contact_links += f"<a href='{contact.linkedin}' target='_blank'>LinkedIn</a> | "
@@ -122,23 +89,90 @@ def generate_portfolio_html(portfolio_data: PortfolioData) -> str:
     if contact.twitter:
         contact_links += f"<a href='{contact.twitter}' target='_blank'>Twitter</a>"
 
-    contact_html = f"""
+    return f"""
         <p>Email: <a href='mailto:{contact.email}'>{contact.email}</a></p>
         <p>Phone: {contact.phone}</p>
         <div class="social-links">{contact_links}</div>
     """
 
-    html = html.replace(
-        """<div class="social-links">
-                    <a href="#">LinkedIn</a> | <a href="#">GitHub</a> | <a href="#">Twitter</a>
-                </div>""",
-        contact_html
-    )
 
-    # ---- Custom Color ----
-    if hasattr(portfolio_data, "custom_css") and portfolio_data.custom_css:
-        css_tag = f"<style>{portfolio_data.custom_css}</style>"
-        html = html.replace("</head>", f"{css_tag}</head>")
+def _render_custom_css(portfolio_data: PortfolioData) -> str:
+    custom_css = getattr(portfolio_data, "custom_css", None)
+    return f"<style>{custom_css}</style>" if custom_css else ""
+
+
+def _render_stylesheet(portfolio_data: PortfolioData) -> str:
+    return f"<style>{get_portfolio_css().content}</style>"
+
+
+def _render_script(portfolio_data: PortfolioData) -> str:
+    return f"<script>{get_portfolio_js().content}</script>"
 
+
+SLOT_RENDERERS = {
+    "name": _render_name,
+    "hero": _render_hero,
+    "about": _render_about,
+    "education": _render_education,
+    "experience": _render_experience,
+    "projects": _render_projects,
+    "contact": _render_contact,
+    "custom_css": _render_custom_css,
+    "stylesheet": _render_stylesheet,
+    "script": _render_script,
+}
+
+
+class CompiledPortfolioTemplate:
+    """
+    portfolio.html split once into static fragments and named slots.
+
+    Rendering fills every slot from the portfolio data and joins the pieces
+    in a single pass. A slot used more than once (the name appears in the
+    title, logo and footer) is rendered once per call.
+    """
+
+    def __init__(self, source: str):
+        self._parts = []  # str for static fragments, slot name otherwise
+        self.slots = set()
+        position = 0
+        for match in _SLOT_PATTERN.finditer(source):
+            name = match.group(1)
+            if name not in SLOT_RENDERERS:
+                raise ValueError(f"Unknown slot '{name}' in portfolio template")
+            self._parts.append(source[position:match.start()])
+            self._parts.append(_SlotRef(name))
+            self.slots.add(name)
+            position = match.end()
+        self._parts.append(source[position:])
+
+    def render(self, portfolio_data: PortfolioData) -> str:
+        values = {name: SLOT_RENDERERS[name](portfolio_data) for name in self.slots}
+        return "".join(values[part.name] if isinstance(part, _SlotRef) else part for part in self._parts)
+
+
+class _SlotRef:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+_template = ReloadingFile(TEMPLATE_PATH, CompiledPortfolioTemplate)
+
+
+def get_portfolio_template() -> CompiledPortfolioTemplate:
+    """Returns the compiled template, recompiling it if portfolio.html changed on disk."""
+    if not TEMPLATE_PATH.exists():
+        raise FileNotFoundError(f"Portfolio template not found at {TEMPLATE_PATH}")
+    return _template.get()
+
+
+def generate_portfolio_html(portfolio_data: PortfolioData) -> str:
+    """
+    Generates a complete HTML portfolio by injecting user data
+    into the provided portfolio.html template. The cached, minified
+    portfolio.css and portfolio.js are inlined so the page is self-contained.
+    """
     # Return final HTML for rendering in Streamlit
-    return html
+    return get_portfolio_template().render(portfolio_data)
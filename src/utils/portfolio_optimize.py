@@ -0,0 +1,180 @@
+import re
+
+# Elements visible before any scrolling: the sticky header/nav and the #home
+# hero. Described as (tag, id, classes) for both page layouts we generate
+# (build_portfolio_from_data and portfolio.html). Classes that scripts add
+# later (e.g. the active nav link) are included so those rules apply at once.
+ABOVE_THE_FOLD = [
+    ("html", None, set()),
+    ("body", None, set()),
+    ("header", None, set()),
+    ("nav", None, set()),
+    ("h1", None, {"logo"}),
+    ("div", None, {"logo"}),
+    ("ul", None, {"nav-links"}),
+    ("li", None, set()),
+    ("a", None, {"active"}),
+    ("main", None, set()),
+    ("section", "home", set()),
+    ("div", None, {"container", "home-content"}),
+    ("h1", None, set()),
+    ("p", None, set()),
+    ("a", None, {"cta-button"}),
+]
+
+# Block-level at-rules whose contents are split rule by rule
+_GROUPING_AT_RULES = ("@media", "@supports")
+# Other at-rules that must be available for the first paint
+_CRITICAL_AT_RULES = ("@charset", "@import", "@font-face")
+
+_COMPOUND = re.compile(r"([a-zA-Z][\w-]*|\*)?((?:[#.][\w-]+)*)")
+_STYLE_BLOCK = re.compile(r"<style>(.*?)</style>", re.DOTALL)
+_INLINE_SCRIPT = re.compile(r"<script>(.*?)</script>", re.DOTALL)
+_PROTECTED = re.compile(r"(<(pre|textarea|script|style)\b.*?</\2>)", re.DOTALL | re.IGNORECASE)
+
+
+def _split_blocks(css: str):
+    """Splits a stylesheet into top-level (prelude, body) pairs; body is None for ';' statements."""
+    blocks = []
+    depth = 0
+    quote = None
+    start = 0
+    brace = None
+    for i, ch in enumerate(css):
+        if quote:
+            if ch == quote and css[i - 1] != "\\":
+                quote = None
+        elif ch in "'\"":
+            quote = ch
+        elif ch == "{":
+            if depth == 0:
+                brace = i
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                blocks.append((css[start:brace].strip(), css[brace + 1:i]))
+                start = i + 1
+        elif ch == ";" and depth == 0:
+            blocks.append((css[start:i].strip(), None))
+            start = i + 1
+    return blocks
+
+
+def _subject_matches(selector: str, elements) -> bool:
+    # Only the rightmost compound decides which element a rule styles;
+    # ancestors are ignored, which can only make the critical set larger
+    subject = re.split(r"[\s>+~]+", selector.strip())[-1]
+    subject = re.sub(r"::?[\w-]+(\([^)]*\))?", "", subject)  # pseudo-classes/elements
+    subject = re.sub(r"\[[^\]]*\]", "", subject)  # attribute selectors
+    if subject in ("", "*", ":root"):
+        return True
+    match = _COMPOUND.fullmatch(subject)
+    if not match:
+        return True  # unknown syntax: keep it critical rather than risk a flash
+    tag = match.group(1)
+    ids = re.findall(r"#([\w-]+)", match.group(2))
+    classes = set(re.findall(r"\.([\w-]+)", match.group(2)))
+    for el_tag, el_id, el_classes in elements:
+        if tag not in (None, "*") and tag != el_tag:
+            continue
+        if ids and ids != [el_id]:
+            continue
+        if not classes <= el_classes:
+            continue
+        return True
+    return False
+
+
+def split_critical_css(css: str, elements=ABOVE_THE_FOLD):
+    """
+    Returns (critical, rest): the rules that can style an above-the-fold
+    element, and everything else. Both halves keep their @media wrappers.
+
+    Loading rest after critical only reorders rules that style different
+    elements, except where a critical rule also matches content further
+    down (plain `p`, `a`, ...) and an earlier rest rule of equal
+    specificity targets the same element.
+    """
+    critical, rest = [], []
+    for prelude, body in _split_blocks(css):
+        if body is None:
+            (critical if prelude.startswith(_CRITICAL_AT_RULES) else rest).append(f"{prelude};")
+        elif prelude.startswith(_GROUPING_AT_RULES):
+            inner_critical, inner_rest = split_critical_css(body, elements)
+            if inner_critical:
+                critical.append(f"{prelude}{{{inner_critical}}}")
+            if inner_rest:
+                rest.append(f"{prelude}{{{inner_rest}}}")
+        elif prelude.startswith("@"):
+            (critical if prelude.startswith(_CRITICAL_AT_RULES) else rest).append(f"{prelude}{{{body}}}")
+        elif prelude == ":root" or any(_subject_matches(s, elements) for s in prelude.split(",")):
+            critical.append(f"{prelude}{{{body}}}")
+        else:
+            rest.append(f"{prelude}{{{body}}}")
+    return "".join(critical), "".join(rest)
+
+
+def collapse_whitespace(html: str) -> str:
+    """Collapses whitespace runs to one space, leaving pre/textarea/script/style untouched."""
+    parts = _PROTECTED.split(html)
+    out = []
+    # re.split with two groups yields: text, whole protected block, tag name, text, ...
+    for i in range(0, len(parts), 3):
+        out.append(re.sub(r"\s{2,}", " ", parts[i]))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return "".join(out).strip()
+
+
+def optimize_portfolio_html(html: str, css_href: str = None, css_src: str = None):
+    """
+    First-paint pass over a generated portfolio page. Returns (html, report).
+
+    - Only the CSS for the header, nav and hero stays in <head>. With inline
+      CSS the remaining rules move to the end of <body>; with a linked
+      stylesheet (css_href, whose text is css_src) the link becomes an
+      async preload with a <noscript> fallback.
+    - Inline scripts become module scripts, which the browser defers until
+      the document is parsed; external scripts get `defer`.
+    - Whitespace between tags and in text is collapsed.
+
+    report holds before/after byte counts and the size of each CSS half.
+    """
+    before = len(html.encode("utf-8"))
+    critical_bytes = deferred_bytes = 0
+
+    if css_href and css_src is not None:
+        critical, rest = split_critical_css(css_src)
+        link = f'<link rel="stylesheet" href="{css_href}">'
+        async_link = (
+            f'<style>{critical}</style>'
+            f'<link rel="preload" href="{css_href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+            f'<noscript>{link}</noscript>'
+        )
+        html = html.replace(link, async_link, 1)
+        critical_bytes, deferred_bytes = len(critical.encode("utf-8")), len(rest.encode("utf-8"))
+    else:
+        head_end = html.find("</head>")
+        match = _STYLE_BLOCK.search(html, 0, head_end) if head_end != -1 else None
+        if match:
+            critical, rest = split_critical_css(match.group(1).strip())
+            html = f"{html[:match.start()]}<style>{critical}</style>{html[match.end():]}"
+            if rest:
+                body_end = html.rfind("</body>")
+                html = f"{html[:body_end]}<style>{rest}</style>{html[body_end:]}"
+            critical_bytes, deferred_bytes = len(critical.encode("utf-8")), len(rest.encode("utf-8"))
+
+    html = _INLINE_SCRIPT.sub(lambda m: f'<script type="module">{m.group(1).strip()}</script>', html)
+    html = re.sub(r"<script src=\"([^\"]+)\"></script>", r'<script src="\1" defer></script>', html)
+    html = collapse_whitespace(html)
+
+    after = len(html.encode("utf-8"))
+    report = {
+        "before_bytes": before,
+        "after_bytes": after,
+        "saved_bytes": before - after,
+        "critical_css_bytes": critical_bytes,
+        "deferred_css_bytes": deferred_bytes,
+    }
+    return html, report
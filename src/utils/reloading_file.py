@@ -0,0 +1,24 @@
+import os
+import threading
+from pathlib import Path
+
+
+class ReloadingFile:
+    """Holds a value compiled from a file and recompiles it when the file's mtime changes."""
+
+    def __init__(self, path: Path, compile):
+        self.path = path
+        self._compile = compile
+        self._value = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        mtime = os.stat(self.path).st_mtime
+        if self._value is not None and self._mtime == mtime:
+            return self._value
+        with self._lock:
+            if self._value is None or self._mtime != mtime:
+                self._value = self._compile(self.path.read_text(encoding="utf-8"))
+                self._mtime = mtime
+            return self._value
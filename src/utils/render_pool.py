@@ -0,0 +1,329 @@
+import atexit
+import itertools
+import logging
+import multiprocessing
+import os
+import resource
+import threading
+from collections import deque
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from multiprocessing.connection import wait
+
+logger = logging.getLogger(__name__)
+
+# Messages sent from a worker to the parent over its pipe: (kind, value, retiring_reason)
+_READY, _DONE, _FAILED = "ready", "done", "failed"
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process, falling back to the peak RSS where /proc is missing."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _worker_main(conn, max_renders, max_rss_bytes):
+    # Imported here so the parent never pays for WeasyPrint unless it renders in-process
+    from src.utils.resume_html_pdf import render_resume_pdf, WARMUP_PAYLOAD
+
+    # The first layout in a process pays for font discovery and engine setup;
+    # do it now so no real request ever sees that latency
+    render_resume_pdf(WARMUP_PAYLOAD)
+    conn.send((_READY, None, None))
+
+    renders = 0
+    while True:
+        try:
+            data = conn.recv()
+        except EOFError:
+            return
+        if data is None:
+            return
+        try:
+            kind, value = _DONE, render_resume_pdf(data)
+        except Exception as e:
+            kind, value = _FAILED, f"{type(e).__name__}: {e}"
+
+        # Decide on retirement before replying so the parent never hands
+        # another render to a worker that is about to exit
+        renders += 1
+        rss = _current_rss_bytes()
+        retiring = None
+        if renders >= max_renders or rss >= max_rss_bytes:
+            retiring = f"{renders} renders, {rss // (1024 * 1024)} MB RSS"
+        conn.send((kind, value, retiring))
+        if retiring:
+            return
+
+
+class RenderPoolUnavailable(RuntimeError):
+    """The pool cannot take the render (shut down or disabled); render in-process instead."""
+
+
+class _Worker:
+    def __init__(self, worker_id, process, conn):
+        self.id = worker_id
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.future = None  # render currently assigned to this worker
+        self.killed = False  # terminated by the pool after a timeout, already replaced
+
+
+class RenderWorkerPool:
+    """
+    Pool of pre-warmed processes that turn resume payloads into PDF bytes.
+
+    Each worker does a throwaway render at startup and only receives work once
+    it reports ready. A worker retires itself after `max_renders` renders or
+    once its RSS passes `max_rss_mb`, and the pool starts a fresh, warmed
+    replacement, so neither first-render latency nor memory growth from large
+    documents reaches the request path. A worker that dies mid-render fails
+    its task and is replaced as well. If workers keep dying before they finish
+    warming up, the pool marks itself broken instead of respawning forever;
+    callers should then render in-process. Renders the pool can no longer
+    take, including those still queued when it breaks or shuts down, fail
+    with RenderPoolUnavailable for the same reason. A worker whose render
+    times out is terminated and replaced.
+
+    Every worker has its own pipe, so a crashed worker can never leave a
+    shared queue lock held.
+    """
+
+    MAX_STARTUP_FAILURES = 3
+
+    def __init__(self, workers: int = 2, max_renders: int = 200, max_rss_mb: int = 512):
+        self.workers = workers
+        self.max_renders = max_renders
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        # spawn keeps children free of the parent's threads and locks
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers = {}
+        self._backlog = deque()  # (future, data) waiting for an idle worker
+        self._worker_ids = itertools.count()
+        self._lock = threading.Lock()
+        # Self-pipe used to wake the collector on shutdown
+        self._wake_r, self._wake_w = self._ctx.Pipe(duplex=False)
+        self._closed = False
+        self.broken = False
+        self._startup_failures = 0
+        self.renders = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.timed_out = 0
+
+        with self._lock:
+            for _ in range(workers):
+                self._spawn_worker()
+        self._collector = threading.Thread(target=self._collect, name="render-pool-collector", daemon=True)
+        self._collector.start()
+        atexit.register(self.shutdown)
+
+    def _spawn_worker(self):
+        """Starts a worker process. Caller holds self._lock."""
+        parent_conn, child_conn = self._ctx.Pipe()
+        worker_id = next(self._worker_ids)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.max_renders, self.max_rss_bytes),
+            name=f"resume-render-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        self._workers[worker_id] = _Worker(worker_id, process, parent_conn)
+
+    def _dispatch(self):
+        """Hands backlog items to idle, warmed workers. Caller holds self._lock."""
+        for worker in self._workers.values():
+            if not self._backlog:
+                return
+            if not worker.ready or worker.future is not None:
+                continue
+            future, data = self._backlog.popleft()
+            if future.cancelled():
+                continue
+            try:
+                worker.conn.send(data)
+            except OSError:
+                # Worker is going away; the exit handler will replace it
+                worker.ready = False
+                self._backlog.appendleft((future, data))
+                continue
+            future.set_running_or_notify_cancel()
+            worker.future = future
+
+    def submit(self, data: dict) -> Future:
+        future = Future()
+        with self._lock:
+            if self._closed or self.broken:
+                raise RenderPoolUnavailable("Render pool is not available")
+            self._backlog.append((future, data))
+            self._dispatch()
+        return future
+
+    def render(self, data: dict, timeout: float = None) -> bytes:
+        future = self.submit(data)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            self._abandon(future)
+            raise
+
+    def _abandon(self, future: Future):
+        """Drops a render that timed out, killing the worker stuck on it."""
+        with self._lock:
+            for worker in self._workers.values():
+                if worker.future is future:
+                    victim = worker
+                    break
+            else:
+                # Never reached a worker (or finished meanwhile); _dispatch skips cancelled ones
+                future.cancel()
+                return
+            # The collector closes the pipe and forgets the worker once the
+            # process is gone; it is replaced right away
+            victim.future = None
+            victim.ready = False
+            victim.killed = True
+            self.timed_out += 1
+            if not self._closed:
+                self._spawn_worker()
+        logger.warning(f"Render worker {victim.id} timed out; terminated and replaced it")
+        victim.process.terminate()
+        future.set_exception(FutureTimeout())
+
+    def is_ready(self) -> bool:
+        """True once at least one worker is warm and the pool can take renders."""
+        with self._lock:
+            return not (self._closed or self.broken) and any(w.ready for w in self._workers.values())
+
+    def _collect(self):
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                handles = {self._wake_r: None}
+                for worker in self._workers.values():
+                    handles[worker.conn] = worker
+                    handles[worker.process.sentinel] = worker
+
+            # The timeout picks up workers spawned since the handle list was built
+            for handle in wait(list(handles), timeout=0.5):
+                worker = handles[handle]
+                if worker is None:
+                    return
+                if handle is worker.conn:
+                    self._handle_message(worker)
+                else:
+                    self._handle_exit(worker)
+
+    def _handle_message(self, worker):
+        try:
+            kind, value, retiring = worker.conn.recv()
+        except (EOFError, OSError):
+            self._handle_exit(worker)
+            return
+
+        future = None
+        with self._lock:
+            if kind == _READY:
+                worker.ready = True
+                self._startup_failures = 0
+                logger.debug(f"Render worker {worker.id} is warm")
+            else:
+                future, worker.future = worker.future, None
+                self.renders += 1
+            if retiring and not worker.killed:
+                logger.info(f"Recycling render worker {worker.id} after {retiring}")
+                self._workers.pop(worker.id, None)
+                self.recycled += 1
+                if not self._closed:
+                    self._spawn_worker()
+            self._dispatch()
+
+        if future is not None:
+            if kind == _DONE:
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
+        if retiring:
+            worker.process.join(timeout=5)
+            worker.conn.close()
+
+    def _handle_exit(self, worker):
+        worker.process.join(timeout=1)
+        abandoned = []
+        unsent = []
+        with self._lock:
+            if self._workers.pop(worker.id, None) is None:
+                return  # already retired cleanly
+            if worker.killed:
+                worker.conn.close()
+                return  # timed out; its replacement is already starting
+            if worker.future is not None:
+                abandoned.append(worker.future)
+            if not worker.ready:
+                self._startup_failures += 1
+            if not self._closed:
+                self.crashed += 1
+            if self._startup_failures >= self.MAX_STARTUP_FAILURES:
+                self.broken = True
+                # Never sent to a worker, so they can safely be rendered in-process
+                unsent = [future for future, _ in self._backlog]
+                self._backlog.clear()
+            elif not self._closed:
+                self._spawn_worker()
+                self._dispatch()
+        worker.conn.close()
+
+        exitcode = worker.process.exitcode
+        for future in abandoned:
+            future.set_exception(RuntimeError(f"Render worker exited with code {exitcode}"))
+        for future in unsent:
+            future.set_exception(RenderPoolUnavailable("Render pool is not available"))
+        if self.broken:
+            logger.error(f"Render workers keep failing to start (last exit code {exitcode}); pool disabled")
+            self.shutdown()
+        elif not self._closed:
+            logger.warning(f"Render worker {worker.id} died (exit code {exitcode}); replaced it")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "broken": self.broken,
+                "workers": sum(1 for w in self._workers.values() if not w.killed),
+                "ready": sum(1 for w in self._workers.values() if w.ready),
+                "busy": sum(1 for w in self._workers.values() if w.future is not None),
+                "queued": len(self._backlog),
+                "renders": self.renders,
+                "recycled": self.recycled,
+                "crashed": self.crashed,
+                "timed_out": self.timed_out,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers.values())
+            self._workers.clear()
+            abandoned = [future for future, _ in self._backlog]
+            abandoned.extend(w.future for w in workers if w.future is not None)
+            self._backlog.clear()
+        for future in abandoned:
+            future.set_exception(RenderPoolUnavailable("Render pool shut down before the render finished"))
+        self._wake_w.send(None)
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
@@ -0,0 +1,160 @@
+import hashlib
+import re
+import threading
+from html import escape
+from io import BytesIO
+from pathlib import Path
+from weasyprint import HTML, CSS
+from weasyprint.text.fonts import FontConfiguration
+from src.utils.reloading_file import ReloadingFile
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "api" / "templates"
+TEMPLATE_PATH = TEMPLATE_DIR / "resume.html"
+STYLESHEET_PATH = TEMPLATE_DIR / "resume.css"
+
+# Bump when the slot renderers below change; template and stylesheet edits are
+# picked up automatically through their content hashes
+RENDERER_VERSION = '3'
+
+# Small but representative document used to warm up fresh render processes
+WARMUP_PAYLOAD = {
+    "personal_info": {"role": "Software Engineer", "email": "jane@example.com", "phone": "000", "linkedin": "", "github": ""},
+    "area_of_expertise": ["Python"],
+    "key_achievements": ["Shipped things"],
+    "experience": [{"title": "Engineer", "company": "Example", "years": "2020-2024", "description": "Built things."}],
+    "education": [{"degree": "B.Sc.", "university": "Example University", "years": "2016-2020"}],
+}
+
+_SLOT_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+def _text(value) -> str:
+    return escape(str(value)) if value is not None else ''
+
+
+# ---- Slot renderers: each returns an already escaped HTML fragment ----
+
+def _render_personal_info(data):
+    info = data.get('personal_info', {})
+    contact = ' | '.join(_text(info.get(key, '')) for key in ('email', 'phone', 'linkedin', 'github'))
+    return f"<p>{_text(info.get('role', ''))}</p>\n            <p>{contact}</p>"
+
+
+def _render_list_items(items):
+    return ''.join(f'<li>{_text(item)}</li>' for item in items)
+
+
+def _render_experience(data):
+    return ''.join(
+        f'<div class="item-title">{_text(exp.get("title", ""))} at {_text(exp.get("company", ""))} ({_text(exp.get("years", ""))})</div>'
+        f'<div class="item-details">{_text(exp.get("description", ""))}</div>'
+        for exp in data.get('experience', [])
+    )
+
+
+def _render_education(data):
+    return ''.join(
+        f'<div class="item-title">{_text(edu.get("degree", ""))} from {_text(edu.get("university", ""))} ({_text(edu.get("years", ""))})</div>'
+        for edu in data.get('education', [])
+    )
+
+
+SLOT_RENDERERS = {
+    'personal_info': _render_personal_info,
+    'area_of_expertise': lambda data: _render_list_items(data.get('area_of_expertise', [])),
+    'key_achievements': lambda data: _render_list_items(data.get('key_achievements', [])),
+    'experience': _render_experience,
+    'education': _render_education,
+}
+
+
+class CompiledTemplate:
+    """
+    Resume template split once into static fragments and named slots.
+
+    `{{ slot_name }}` markers in the source become slots; everything between
+    them is kept verbatim. Rendering fills each slot from the payload and joins
+    the pieces, so the static markup is never rebuilt per request.
+    """
+
+    def __init__(self, source: str):
+        self.version = f"{RENDERER_VERSION}-{hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]}"
+        self._parts = []  # str for static fragments, callable for slots
+        position = 0
+        for match in _SLOT_PATTERN.finditer(source):
+            name = match.group(1)
+            if name not in SLOT_RENDERERS:
+                raise ValueError(f"Unknown slot '{name}' in resume template")
+            self._parts.append(source[position:match.start()])
+            self._parts.append(SLOT_RENDERERS[name])
+            position = match.end()
+        self._parts.append(source[position:])
+
+    def render(self, data: dict) -> str:
+        return ''.join(part if isinstance(part, str) else part(data) for part in self._parts)
+
+
+class CompiledStylesheet:
+    """The resume stylesheet parsed once into a WeasyPrint CSS object."""
+
+    def __init__(self, source: str):
+        self.version = hashlib.sha256(source.encode('utf-8')).hexdigest()[:16]
+        self.css = CSS(string=source, font_config=get_font_config())
+
+
+# One font configuration and one resource cache per process: fonts are
+# discovered once and any images a document references are decoded once,
+# instead of on every write_pdf() call.
+_font_config = None
+_font_config_lock = threading.Lock()
+_resource_cache = {}
+# The shared font configuration is not safe for concurrent layouts; layout is
+# GIL-bound anyway, so threads rendering in-process take turns
+_render_lock = threading.Lock()
+
+_template = ReloadingFile(TEMPLATE_PATH, CompiledTemplate)
+_stylesheet = ReloadingFile(STYLESHEET_PATH, CompiledStylesheet)
+
+
+def get_font_config() -> FontConfiguration:
+    global _font_config
+    if _font_config is None:
+        with _font_config_lock:
+            if _font_config is None:
+                _font_config = FontConfiguration()
+    return _font_config
+
+
+def get_resume_template() -> CompiledTemplate:
+    """Returns the compiled template, recompiling it if the file changed on disk."""
+    return _template.get()
+
+
+def get_resume_stylesheet() -> CompiledStylesheet:
+    """Returns the parsed stylesheet, re-parsing it if the file changed on disk."""
+    return _stylesheet.get()
+
+
+def template_version() -> str:
+    """Identifies the current template and stylesheet so cached PDFs are not reused across edits."""
+    return f"{get_resume_template().version}-{get_resume_stylesheet().version}"
+
+
+def build_resume_html(data):
+    """Builds the HTML document WeasyPrint lays out for a validated resume payload."""
+    return get_resume_template().render(data)
+
+
+def render_resume_pdf(data) -> bytes:
+    """Renders a validated resume payload to PDF bytes in the current process."""
+    html = build_resume_html(data)
+    stylesheet = get_resume_stylesheet()
+    pdf_buffer = BytesIO()
+    with _render_lock:
+        HTML(string=html).write_pdf(
+            pdf_buffer,
+            stylesheets=[stylesheet.css],
+            font_config=get_font_config(),
+            cache=_resource_cache,
+        )
+    return pdf_buffer.getvalue()
@@ -1,94 +1,398 @@
+import hashlib
+import json
+import logging
+import tempfile
+import threading
+from collections import Counter
+from io import BytesIO
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, ListFlowable, ListItem
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, Table, TableStyle, ListFlowable, ListItem
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.lib.fonts import addMapping
+from src.utils.lru_cache import LRUCache
 
-def build_resume_pdf(target, data):
+logger = logging.getLogger(__name__)
+
+# Streamed PDFs stay in memory up to this size before spilling to a temp file
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+
+class RenderCancelled(Exception):
+    """Raised out of a render whose cancel event was set before it finished."""
+
+
+def _reset_postponed(flowable):
     """
-    target can be a path string (e.g., 'resume.pdf') OR a file-like buffer (e.g., io.BytesIO()).
+    A flowable pushed to the next page is tagged _postponed and ReportLab never
+    clears it; a reused flowable would then be treated as "too large" the next
+    time it has to move. ListFlowable hands out the same item wrappers on every
+    split, so nested flowables are cleared as well.
+    """
+    flowable.__dict__.pop("_postponed", None)
+    children = flowable.__dict__.get("_list_content") or flowable.__dict__.get("_content")
+    if isinstance(children, (list, tuple)):
+        for child in children:
+            _reset_postponed(child)
+    child = flowable.__dict__.get("_flowable")
+    if child is not None:
+        _reset_postponed(child)
+
+
+class _FlowableStream:
+    """
+    List stand-in for doc.build() that pulls flowables from an iterator.
+
+    BaseDocTemplate only ever works at the front of its flowable list: it
+    reads and deletes flowables[0], puts split remainders back with insert()
+    or slice assignment, and looks a few items ahead for keepWithNext chains.
+    Keeping a small look-ahead buffer filled from the iterator satisfies all
+    of that, so the full story never has to exist at once.
+    """
+
+    LOOKAHEAD = 16
+
+    def __init__(self, iterable):
+        self._source = iter(iterable)
+        self._buffer = []
+
+    def _fill(self, count):
+        while self._source is not None and len(self._buffer) < count:
+            try:
+                self._buffer.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        # Only the look-ahead is visible; that is enough for the build loop
+        # and for keepWithNext chains up to LOOKAHEAD flowables long
+        self._fill(self.LOOKAHEAD)
+        return len(self._buffer)
+
+    def _reach(self, index):
+        if isinstance(index, slice):
+            if index.stop is None or index.stop < 0:
+                self._fill(float("inf"))
+            else:
+                self._fill(index.stop)
+        elif index < 0:
+            self._fill(float("inf"))
+        else:
+            self._fill(index + 1)
+
+    def __getitem__(self, index):
+        self._reach(index)
+        return self._buffer[index]
+
+    def __setitem__(self, index, value):
+        self._reach(index)
+        self._buffer[index] = value
+
+    def __delitem__(self, index):
+        self._reach(index)
+        del self._buffer[index]
+
+    def insert(self, index, value):
+        self._buffer.insert(index, value)
+
+
+class ResumeRenderer:
     """
-    doc = SimpleDocTemplate(
-        target,                  # accepts file-like or path
-        pagesize=A4,
-        topMargin=28,
-        bottomMargin=28,
-        leftMargin=32,
-        rightMargin=32
-    )
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(name="Name", fontSize=18, leading=22, spaceAfter=6, alignment=1))  # center
-    styles.add(ParagraphStyle(name="Role", fontSize=10.5, leading=14, spaceAfter=6, alignment=1))
-    styles.add(ParagraphStyle(name="Contact", fontSize=9.5, textColor=colors.grey, alignment=1, spaceAfter=10))
-    styles.add(ParagraphStyle(name="H", fontSize=10.5, leading=14, spaceBefore=10, spaceAfter=4, textTransform="uppercase"))
-    styles.add(ParagraphStyle(name="Body", fontSize=10.3, leading=14))
-    styles.add(ParagraphStyle(name="Subtle", fontSize=9.8, textColor=colors.grey))
-
-    story = []
-    story.append(Paragraph(data["name"], styles["Name"]))
-    story.append(Paragraph(data.get("role",""), styles["Role"]))
-    contact = " | ".join([x for x in [data.get("location"), data.get("email"), data.get("phone"), data.get("linkedin"), data.get("website")] if x])
-    story.append(Paragraph(contact, styles["Contact"]))
-    if data.get("summary"):
-        story.append(Paragraph(data["summary"], styles["Body"]))
-
-    # Skills grid (2 columns)
-    if data.get("skills"):
-        story.append(Paragraph("Area of Expertise", styles["H"]))
-        skills = data["skills"]
+    Long-lived ReportLab resume renderer.
+
+    The stylesheet, fonts and page templates are set up once in the
+    constructor; render() then only builds the flowables for each resume.
+    Keep one instance around (see get_default_renderer) for bulk exports
+    and repeated downloads.
+
+    Flowables are cached per section, keyed by a hash of that section's data,
+    so re-rendering after an edit only rebuilds the sections that changed.
+
+    fonts optionally maps 'regular', 'bold', 'italic' and 'bold_italic' to
+    TrueType files that replace the built-in Helvetica family.
+    """
+
+    def __init__(self, pagesize=A4, margins=(28, 28, 32, 32), fonts: dict = None, section_cache_size: int = 256):
+        self.pagesize = pagesize
+        self.top_margin, self.bottom_margin, self.left_margin, self.right_margin = margins
+        self.font_family = self._register_fonts(fonts) if fonts else None
+        self.styles = self._build_styles()
+        self.page_templates = self._build_page_templates()
+        self.section_cache = LRUCache(max_entries=section_cache_size)
+        self.section_hits = Counter()
+        self.section_misses = Counter()
+        # Frames carry per-page layout state, so builds sharing them take turns
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _register_fonts(fonts: dict) -> str:
+        family = "ResumeFont"
+        variants = {
+            "regular": (family, 0, 0),
+            "bold": (f"{family}-Bold", 1, 0),
+            "italic": (f"{family}-Italic", 0, 1),
+            "bold_italic": (f"{family}-BoldItalic", 1, 1),
+        }
+        for key, (name, bold, italic) in variants.items():
+            path = fonts.get(key) or fonts["regular"]
+            if name not in pdfmetrics.getRegisteredFontNames():
+                pdfmetrics.registerFont(TTFont(name, path))
+            addMapping(family, bold, italic, name)
+        return family
+
+    def _build_styles(self):
+        styles = getSampleStyleSheet()
+        styles.add(ParagraphStyle(name="Name", fontSize=18, leading=22, spaceAfter=6, alignment=1))  # center
+        styles.add(ParagraphStyle(name="Role", fontSize=10.5, leading=14, spaceAfter=6, alignment=1))
+        styles.add(ParagraphStyle(name="Contact", fontSize=9.5, textColor=colors.grey, alignment=1, spaceAfter=10))
+        styles.add(ParagraphStyle(name="H", fontSize=10.5, leading=14, spaceBefore=10, spaceAfter=4, textTransform="uppercase"))
+        styles.add(ParagraphStyle(name="Body", fontSize=10.3, leading=14))
+        styles.add(ParagraphStyle(name="Subtle", fontSize=9.8, textColor=colors.grey))
+        if self.font_family:
+            for name in ("Name", "Role", "Contact", "H", "Body", "Subtle"):
+                styles[name].fontName = self.font_family
+        self.skills_table_style = TableStyle([('BOTTOMPADDING', (0, 0), (-1, -1), 2)])
+        if self.font_family:
+            self.skills_table_style.add('FONTNAME', (0, 0), (-1, -1), self.font_family)
+        return styles
+
+    def _build_page_templates(self):
+        width, height = self.pagesize
+        frame = Frame(
+            self.left_margin,
+            self.bottom_margin,
+            width - self.left_margin - self.right_margin,
+            height - self.top_margin - self.bottom_margin,
+            id='normal'
+        )
+        return [PageTemplate(id='Resume', frames=frame, pagesize=self.pagesize)]
+
+    # Each section is built from its own slice of the resume data, so its
+    # flowables can be reused until that slice changes
+    SECTIONS = ("header", "skills", "experience", "education", "projects", "additional")
+    HEADER_FIELDS = ("name", "role", "location", "email", "phone", "linkedin", "website", "summary")
+
+    def _section_data(self, section, data):
+        if section == "header":
+            return {key: data.get(key) for key in self.HEADER_FIELDS}
+        return data.get(section)
+
+    # Section builders are generators so the streaming path can lay out one
+    # entry at a time; the cached path simply collects them into lists
+
+    def _iter_header(self, data):
+        styles = self.styles
+        yield Paragraph(data["name"], styles["Name"])
+        yield Paragraph(data.get("role",""), styles["Role"])
+        contact = " | ".join([x for x in [data.get("location"), data.get("email"), data.get("phone"), data.get("linkedin"), data.get("website")] if x])
+        yield Paragraph(contact, styles["Contact"])
+        if data.get("summary"):
+            yield Paragraph(data["summary"], styles["Body"])
+
+    def _iter_skills(self, skills):
+        # Skills grid (2 columns)
+        if not skills:
+            return
         rows = []
         for i in range(0, len(skills), 2):
             left = skills[i]
             right = skills[i+1] if i+1 < len(skills) else ""
             rows.append([left, right])
         tbl = Table(rows, colWidths=[250, 250])
-        tbl.setStyle(TableStyle([('BOTTOMPADDING',(0,0),(-1,-1),2)]))
-        story.append(tbl)
+        tbl.setStyle(self.skills_table_style)
+        yield Paragraph("Area of Expertise", self.styles["H"])
+        yield tbl
 
-    # Experience
-    if data.get("experience"):
-        story.append(Paragraph("Professional Experience", styles["H"]))
-        for e in data["experience"]:
+    def _iter_experience(self, experience):
+        if not experience:
+            return
+        styles = self.styles
+        yield Paragraph("Professional Experience", styles["H"])
+        for e in experience:
             years = e.get("years") or f'{e.get("start_date","")} – {e.get("end_date","")}'
-            story.append(Paragraph(f'<b>{e.get("title","")}</b>', styles["Body"]))
+            yield Paragraph(f'<b>{e.get("title","")}</b>', styles["Body"])
             sub = " · ".join([x for x in [e.get("company"), e.get("location")] if x])
-            story.append(Paragraph(sub, styles["Subtle"]))
+            yield Paragraph(sub, styles["Subtle"])
             items = e.get("details")
             if not items:
                 desc = (e.get("description") or "").strip().splitlines()
                 items = [d for d in desc if d.strip()]
             if items:
-                story.append(ListFlowable([ListItem(Paragraph(i, styles["Body"])) for i in items], bulletType='bullet'))
-            story.append(Paragraph(years, styles["Subtle"]))
-            story.append(Spacer(1, 6))
-
-    # Education
-    if data.get("education"):
-        story.append(Paragraph("Education", styles["H"]))
-        for ed in data["education"]:
+                yield ListFlowable([ListItem(Paragraph(i, styles["Body"])) for i in items], bulletType='bullet')
+            yield Paragraph(years, styles["Subtle"])
+            yield Spacer(1, 6)
+
+    def _iter_education(self, education):
+        if not education:
+            return
+        styles = self.styles
+        yield Paragraph("Education", styles["H"])
+        for ed in education:
             years = ed.get("years") or f'{ed.get("start_date","")} – {ed.get("end_date","")}'
-            story.append(Paragraph(f'<b>{ed.get("degree","")}</b>', styles["Body"]))
+            yield Paragraph(f'<b>{ed.get("degree","")}</b>', styles["Body"])
             sub = " · ".join([x for x in [ed.get("institution"), ed.get("location")] if x])
-            story.append(Paragraph(sub, styles["Subtle"]))
+            yield Paragraph(sub, styles["Subtle"])
             if ed.get("details"):
-                story.append(ListFlowable([ListItem(Paragraph(i, styles["Body"])) for i in ed["details"]], bulletType='bullet'))
-            story.append(Paragraph(years, styles["Subtle"]))
-            story.append(Spacer(1, 6))
-
-    # Projects
-    if data.get("projects"):
-        story.append(Paragraph("Projects", styles["H"]))
-        for p in data["projects"]:
-            story.append(Paragraph(f'<b>{p.get("name","")}</b>', styles["Body"]))
-            story.append(Paragraph(p.get("role",""), styles["Subtle"]))
-            if p.get("description"): story.append(Paragraph(p["description"], styles["Body"]))
-            if p.get("technologies"): story.append(Paragraph(f'<b>Technologies:</b> {p["technologies"]}', styles["Subtle"]))
-            if p.get("link"): story.append(Paragraph(p["link"], styles["Subtle"]))
-            if p.get("period"): story.append(Paragraph(p["period"], styles["Subtle"]))
-            story.append(Spacer(1, 6))
-
-    # Additional
-    if data.get("additional"):
-        story.append(Paragraph("Additional Information", styles["H"]))
-        story.append(ListFlowable([ListItem(Paragraph(i, styles["Body"])) for i in data["additional"]], bulletType='bullet'))
-
-    doc.build(story)
+                yield ListFlowable([ListItem(Paragraph(i, styles["Body"])) for i in ed["details"]], bulletType='bullet')
+            yield Paragraph(years, styles["Subtle"])
+            yield Spacer(1, 6)
+
+    def _iter_projects(self, projects):
+        if not projects:
+            return
+        styles = self.styles
+        yield Paragraph("Projects", styles["H"])
+        for p in projects:
+            yield Paragraph(f'<b>{p.get("name","")}</b>', styles["Body"])
+            yield Paragraph(p.get("role",""), styles["Subtle"])
+            if p.get("description"): yield Paragraph(p["description"], styles["Body"])
+            if p.get("technologies"): yield Paragraph(f'<b>Technologies:</b> {p["technologies"]}', styles["Subtle"])
+            if p.get("link"): yield Paragraph(p["link"], styles["Subtle"])
+            if p.get("period"): yield Paragraph(p["period"], styles["Subtle"])
+            yield Spacer(1, 6)
+
+    def _iter_additional(self, additional):
+        if not additional:
+            return
+        styles = self.styles
+        yield Paragraph("Additional Information", styles["H"])
+        yield ListFlowable([ListItem(Paragraph(i, styles["Body"])) for i in additional], bulletType='bullet')
+
+    def _section_flowables(self, section, data):
+        section_data = self._section_data(section, data)
+        digest = hashlib.sha1(json.dumps(section_data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        key = (section, digest)
+        flowables = self.section_cache.get(key)
+        if flowables is None:
+            self.section_misses[section] += 1
+            flowables = list(getattr(self, f"_iter_{section}")(section_data))
+            self.section_cache.put(key, flowables)
+        else:
+            self.section_hits[section] += 1
+        return flowables
+
+    def build_story(self, data) -> list:
+        story = []
+        for section in self.SECTIONS:
+            story.extend(self._section_flowables(section, data))
+        return story
+
+    def iter_story(self, data):
+        """Yields the resume's flowables one by one, bypassing the section cache."""
+        for section in self.SECTIONS:
+            yield from getattr(self, f"_iter_{section}")(self._section_data(section, data))
+
+    def cache_stats(self) -> dict:
+        """Hit/miss counts of the section flowable cache, overall and per section."""
+        stats = self.section_cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["sections"] = {
+            section: {"hits": self.section_hits[section], "misses": self.section_misses[section]}
+            for section in self.SECTIONS
+        }
+        return stats
+
+    def render(self, data, target, cancel_event: threading.Event = None):
+        """
+        target can be a path string (e.g., 'resume.pdf') OR a file-like buffer (e.g., io.BytesIO()).
+
+        If cancel_event is set while the PDF is being laid out, the build stops
+        after the current flowable and RenderCancelled is raised.
+        """
+        doc = BaseDocTemplate(
+            target,                  # accepts file-like or path
+            pagesize=self.pagesize,
+            topMargin=self.top_margin,
+            bottomMargin=self.bottom_margin,
+            leftMargin=self.left_margin,
+            rightMargin=self.right_margin,
+            pageTemplates=self.page_templates
+        )
+        if cancel_event is not None:
+            def _check_cancelled(kind, value):
+                if cancel_event.is_set():
+                    raise RenderCancelled()
+            doc.setProgressCallBack(_check_cancelled)
+        with self._lock:
+            story = self.build_story(data)
+            for flowable in story:
+                _reset_postponed(flowable)
+            doc.build(story)
+        logger.debug(f"Resume section cache: {self.cache_stats()}")
+
+    def render_streaming(self, data, target=None, spool_max_bytes: int = SPOOL_MAX_BYTES):
+        """
+        Low-memory render for very long CVs.
+
+        Flowables are produced on demand while ReportLab lays out the pages,
+        so only the entries around the current page exist at any time.
+        Without a target the PDF
+        goes to a SpooledTemporaryFile that moves to disk past
+        spool_max_bytes; it is returned rewound and the caller closes it.
+        """
+        spool = None
+        if target is None:
+            target = spool = tempfile.SpooledTemporaryFile(max_size=spool_max_bytes)
+        doc = BaseDocTemplate(
+            target,
+            pagesize=self.pagesize,
+            topMargin=self.top_margin,
+            bottomMargin=self.bottom_margin,
+            leftMargin=self.left_margin,
+            rightMargin=self.right_margin,
+            pageTemplates=self.page_templates
+        )
+        try:
+            with self._lock:
+                doc.build(_FlowableStream(self.iter_story(data)))
+        except Exception:
+            if spool is not None:
+                spool.close()
+            raise
+        if spool is not None:
+            spool.seek(0)
+            return spool
+        return target
+
+    def render_to_bytes(self, data, cancel_event: threading.Event = None) -> bytes:
+        buf = BytesIO()
+        self.render(data, buf, cancel_event=cancel_event)
+        return buf.getvalue()
+
+    def render_many(self, resumes, targets=None):
+        """
+        Renders resumes back-to-back with the shared setup. With targets (paths
+        or buffers, one per resume) each PDF is written there; without, the
+        PDF bytes are yielded one resume at a time.
+        """
+        if targets is None:
+            for data in resumes:
+                yield self.render_to_bytes(data)
+            return
+        for data, target in zip(resumes, targets):
+            self.render(data, target)
+            yield target
+
+
+_default_renderer = None
+_default_renderer_lock = threading.Lock()
+
+
+def get_default_renderer() -> ResumeRenderer:
+    """Process-wide renderer shared by every caller (and every Streamlit session)."""
+    global _default_renderer
+    if _default_renderer is None:
+        with _default_renderer_lock:
+            if _default_renderer is None:
+                _default_renderer = ResumeRenderer()
+    return _default_renderer
+
+
+def build_resume_pdf(target, data):
+    """
+    target can be a path string (e.g., 'resume.pdf') OR a file-like buffer (e.g., io.BytesIO()).
+    """
+    get_default_renderer().render(data, target)
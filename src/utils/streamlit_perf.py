@@ -0,0 +1,93 @@
+import functools
+import logging
+import os
+import threading
+import time
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "_rerun_stats"
+
+# Set to show the per-session rerun table in the sidebar
+SHOW_RERUN_STATS = os.getenv("RESUME_SHOW_RERUN_STATS", "").lower() in ("1", "true", "yes")
+
+# Each session's script runs on its own thread; this marks a full page run
+# so fragment runs inside it can be told apart from isolated fragment reruns
+_run_state = threading.local()
+
+
+def _record(name: str, elapsed_ms: float, isolated: bool):
+    stats = st.session_state.setdefault(STATS_KEY, {})
+    entry = stats.setdefault(name, {"runs": 0, "isolated_runs": 0, "total_ms": 0.0, "last_ms": 0.0})
+    entry["runs"] += 1
+    entry["isolated_runs"] += isolated
+    entry["total_ms"] += elapsed_ms
+    entry["last_ms"] = elapsed_ms
+    logger.debug(f"{name} ran in {elapsed_ms:.1f} ms ({'fragment rerun' if isolated else 'full run'})")
+
+
+def track_page(name: str):
+    """Decorator for a page's show(): counts and times every full run of the page."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            _run_state.page = name
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _run_state.page = None
+                _record(name, (time.perf_counter() - start) * 1000, isolated=False)
+        return wrapper
+    return decorate
+
+
+def fragment(name: str, run_every=None):
+    """
+    st.fragment that also counts and times its runs.
+
+    Widgets inside the function rerun only the function; with run_every
+    (seconds) it also reruns on its own at that interval. Runs that happen as
+    part of a full page run are counted too; isolated_runs holds the reruns
+    that skipped the rest of the page.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            isolated = getattr(_run_state, "page", None) is None
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(name, (time.perf_counter() - start) * 1000, isolated=isolated)
+        return st.fragment(wrapper, run_every=run_every)
+    return decorate
+
+
+def rerun_stats() -> dict:
+    """This session's run counts and timings, with the mean per run added."""
+    stats = {}
+    for name, entry in st.session_state.get(STATS_KEY, {}).items():
+        stats[name] = dict(entry, mean_ms=round(entry["total_ms"] / entry["runs"], 2) if entry["runs"] else 0.0)
+    return stats
+
+
+def show_rerun_stats():
+    """Sidebar table of rerun_stats(), when RESUME_SHOW_RERUN_STATS is set."""
+    if not SHOW_RERUN_STATS:
+        return
+    stats = rerun_stats()
+    if not stats:
+        return
+    with st.sidebar.expander("⏱ Rerun stats"):
+        st.table([
+            {
+                "": name,
+                "runs": entry["runs"],
+                "fragment-only": entry["isolated_runs"],
+                "mean ms": f"{entry['mean_ms']:.1f}",
+                "last ms": f"{entry['last_ms']:.1f}",
+            }
+            for name, entry in stats.items()
+        ])
@@ -0,0 +1,67 @@
+import asyncio
+import time
+from src.utils.ai_backends import BackendUnavailable, StubBackend
+from src.utils.ai_batch import RequestsPerMinuteLimiter, generate_batch
+
+
+def test_limiter_spreads_requests_over_the_window():
+    async def acquire_all():
+        limiter = RequestsPerMinuteLimiter(rpm=2, window=0.3)
+        times = []
+        for _ in range(5):
+            await limiter.acquire()
+            times.append(time.monotonic())
+        return times
+
+    times = asyncio.run(acquire_all())
+    # Never more than two acquisitions in any 0.3 s window
+    for i in range(2, len(times)):
+        assert times[i] - times[i - 2] >= 0.3 - 0.01
+    assert times[-1] - times[0] < 1.0
+
+
+def test_results_keep_input_order():
+    prompts = [f"prompt {i}" for i in range(6)]
+    stub = StubBackend(latency=0.02, jitter=0.015, seed=1)
+    assert generate_batch(prompts, backend=stub, concurrency=3, rpm=0) == [stub.generate(p) for p in prompts]
+
+
+class _FlakyBackend:
+    model_name = "flaky"
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def generate(self, prompt):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError("rate limited")
+        return prompt.upper()
+
+
+def test_failed_requests_are_retried():
+    backend = _FlakyBackend(failures=2)
+    assert generate_batch(["hi"], backend=backend, rpm=0, retries=3, backoff=0.001) == ["HI"]
+    assert backend.calls == 3
+
+
+def test_persistent_failure_yields_an_error_string():
+    backend = _FlakyBackend(failures=10)
+    [result] = generate_batch(["hi"], backend=backend, rpm=0, retries=1, backoff=0.001)
+    assert result.startswith("Error generating AI content")
+    assert backend.calls == 2
+
+
+def test_unavailable_backend_is_not_retried():
+    class Unavailable:
+        model_name = "none"
+        calls = 0
+
+        def generate(self, prompt):
+            self.calls += 1
+            raise BackendUnavailable("no API key")
+
+    backend = Unavailable()
+    assert generate_batch(["hi"], backend=backend, rpm=0) == ["Error: no API key"]
+    assert backend.calls == 1
@@ -0,0 +1,69 @@
+from src.utils import ai_cache
+from src.utils.ai_cache import AIResponseCache, ai_cache_key
+
+
+class _Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def test_key_depends_on_model_and_prompt():
+    assert ai_cache_key("m", "prompt") == ai_cache_key("m", "prompt")
+    assert ai_cache_key("m", "prompt") != ai_cache_key("other", "prompt")
+    assert ai_cache_key("m", "prompt") != ai_cache_key("m", "prompt ")
+
+
+def test_memory_then_disk_hits(tmp_path):
+    path = str(tmp_path / "ai.sqlite3")
+    cache = AIResponseCache(path)
+    assert cache.get("k") == (None, None)
+    cache.put("k", "answer")
+    assert cache.get("k") == ("answer", "memory")
+    # A new process only has the SQLite tier
+    assert AIResponseCache(path).get("k") == ("answer", "disk")
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ai_cache, "time", clock)
+    path = str(tmp_path / "ai.sqlite3")
+    cache = AIResponseCache(path, ttl=60)
+    cache.put("k", "answer")
+
+    clock.now += 59
+    assert cache.get("k") == ("answer", "memory")
+    assert AIResponseCache(path, ttl=60).get("k") == ("answer", "disk")
+
+    clock.now += 2
+    assert cache.get("k") == (None, None)
+    assert AIResponseCache(path, ttl=60).get("k") == (None, None)
+    assert cache.stats()["expired"] == 1
+
+
+def test_memory_tier_is_bounded_by_bytes(tmp_path):
+    cache = AIResponseCache(str(tmp_path / "ai.sqlite3"), memory_max_bytes=100)
+    for i in range(5):
+        cache.put(str(i), "é" * 20)  # 40 bytes each in UTF-8
+    stats = cache.stats()
+    assert stats["memory_entries"] == 2
+    assert stats["memory_bytes"] == 80
+    assert stats["disk_entries"] == 5
+    assert cache.get("0") == ("é" * 20, "disk")
+
+
+def test_disk_tier_evicts_least_recently_read(tmp_path, monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(ai_cache, "time", clock)
+    cache = AIResponseCache(str(tmp_path / "ai.sqlite3"), memory_max_entries=1, disk_max_entries=2)
+    cache.put("a", "1")
+    clock.now += 1
+    cache.put("b", "2")
+    clock.now += 1
+    assert cache.get("a") == ("1", "disk")  # "b" is now the least recently read
+    clock.now += 1
+    cache.put("c", "3")
+    assert cache.get("b") == (None, None)
+    assert cache.stats()["disk_evictions"] == 1
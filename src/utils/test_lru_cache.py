@@ -0,0 +1,45 @@
+from src.utils.lru_cache import LRUCache
+
+
+def test_get_hit_and_miss():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", b"1")
+    assert cache.get("a") == b"1"
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_evicts_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", b"1")
+    cache.put("b", b"2")
+    cache.get("a")  # "b" is now the oldest
+    cache.put("c", b"3")
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.stats()["evictions"] == 1
+
+
+def test_bounded_by_bytes():
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.put("a", b"x" * 4)
+    cache.put("b", b"x" * 4)
+    cache.put("c", b"x" * 4)
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 8
+
+
+def test_rejects_value_larger_than_max_bytes():
+    cache = LRUCache(max_bytes=4)
+    assert cache.put("a", b"x" * 5) is False
+    assert "a" not in cache
+
+
+def test_replacing_a_key_keeps_sizes_consistent():
+    cache = LRUCache(max_bytes=10)
+    cache.put("a", b"x" * 6)
+    cache.put("a", b"x" * 2)
+    assert cache.stats()["bytes"] == 2
+    assert cache.pop("a") == b"xx"
+    assert cache.stats()["bytes"] == 0
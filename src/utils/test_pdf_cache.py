@@ -0,0 +1,53 @@
+import os
+from src.utils.pdf_cache import PDFRenderCache, payload_cache_key
+
+
+def test_payload_key_ignores_key_order():
+    first = payload_cache_key({"a": 1, "b": [1, 2]}, "v1")
+    second = payload_cache_key({"b": [1, 2], "a": 1}, "v1")
+    assert first == second
+    assert payload_cache_key({"a": 1, "b": [1, 2]}, "v2") != first
+
+
+def test_miss_then_memory_hit(tmp_path):
+    cache = PDFRenderCache(str(tmp_path))
+    calls = []
+
+    def render():
+        calls.append(1)
+        return b"%PDF-1"
+
+    assert cache.get_or_render("k", render) == (b"%PDF-1", None)
+    assert cache.get_or_render("k", render) == (b"%PDF-1", "memory")
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_disk_hit_survives_a_new_instance(tmp_path):
+    PDFRenderCache(str(tmp_path)).put("k", b"%PDF-1")
+    cache = PDFRenderCache(str(tmp_path))
+    assert cache.get("k") == (b"%PDF-1", "disk")
+    # Promoted into memory by the disk hit
+    assert cache.get("k") == (b"%PDF-1", "memory")
+
+
+def test_memory_tier_evicts_by_bytes(tmp_path):
+    cache = PDFRenderCache(str(tmp_path), memory_max_bytes=10)
+    cache.put("a", b"x" * 6)
+    cache.put("b", b"y" * 6)
+    assert cache.get("a") == (b"x" * 6, "disk")
+    assert cache.stats()["memory_evictions"] >= 1
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = PDFRenderCache(str(tmp_path), memory_max_bytes=1, disk_max_bytes=10)
+    cache.put("a", b"x" * 4)
+    cache.put("b", b"y" * 4)
+    cache.get("a")  # "b" is now the oldest on disk
+    cache.put("c", b"z" * 4)
+    assert cache.get("b") == (None, None)
+    assert cache.get("a")[0] == b"x" * 4
+    assert sorted(os.listdir(tmp_path)) == ["a.pdf", "c.pdf"]
+    assert cache.stats()["disk_evictions"] == 1
+    assert cache.stats()["disk_bytes"] == 8
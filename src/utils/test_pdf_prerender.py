@@ -0,0 +1,66 @@
+import threading
+import time
+from src.utils.pdf_prerender import PDFPrerenderer
+from src.utils.resume_pdf_template import RenderCancelled
+
+
+def _render(data, cancel_event):
+    return f"%PDF {data}".encode()
+
+
+def test_render_starts_after_the_debounce():
+    prerenderer = PDFPrerenderer(render=_render, debounce=0.2)
+    prerenderer.request("a", "A")
+    assert prerenderer.status("a") == "pending"
+    time.sleep(0.05)
+    assert prerenderer.get("a") is None
+    assert prerenderer.wait("a", "A", timeout=5) == b"%PDF A"
+    assert prerenderer.status("a") == "ready"
+
+
+def test_newer_request_supersedes_a_pending_one():
+    calls = []
+
+    def render(data, cancel_event):
+        calls.append(data)
+        return _render(data, cancel_event)
+
+    prerenderer = PDFPrerenderer(render=render, debounce=0.1)
+    prerenderer.request("a", "A")
+    prerenderer.request("b", "B")
+    assert prerenderer.wait("b", "B", timeout=5) == b"%PDF B"
+    assert calls == ["B"]
+    assert prerenderer.get("a") is None
+
+
+def test_newer_request_cancels_a_running_render():
+    started = threading.Event()
+
+    def render(data, cancel_event):
+        if data == "slow":
+            started.set()
+            while not cancel_event.wait(0.01):
+                pass
+            raise RenderCancelled()
+        return _render(data, cancel_event)
+
+    prerenderer = PDFPrerenderer(render=render, debounce=0)
+    prerenderer.request("a", "slow")
+    assert started.wait(5)
+    assert prerenderer.status("a") == "rendering"
+    assert prerenderer.wait("b", "B", timeout=5) == b"%PDF B"
+    assert prerenderer.cancelled == 1
+
+
+def test_ready_key_is_not_rendered_again():
+    calls = []
+
+    def render(data, cancel_event):
+        calls.append(data)
+        return _render(data, cancel_event)
+
+    prerenderer = PDFPrerenderer(render=render, debounce=0)
+    prerenderer.wait("a", "A", timeout=5)
+    prerenderer.request("a", "A")
+    assert prerenderer.status("a") == "ready"
+    assert calls == ["A"]
@@ -0,0 +1,49 @@
+from src.utils.portfolio_optimize import collapse_whitespace, optimize_portfolio_html, split_critical_css
+
+
+def test_split_keeps_above_the_fold_rules_critical():
+    css = (
+        "@font-face{font-family:X;src:url(x.woff2)}"
+        ":root{--accent:#06f}"
+        "header .logo{color:var(--accent)}"
+        "#home .cta-button:hover{opacity:.8}"
+        ".project-card{padding:1rem}"
+        "@media (max-width:600px){.nav-links{display:none}.project-card{padding:0}}"
+    )
+    critical, rest = split_critical_css(css)
+    assert "@font-face" in critical
+    assert ":root{--accent:#06f}" in critical
+    assert "header .logo" in critical and ".cta-button:hover" in critical
+    assert "@media (max-width:600px){.nav-links{display:none}}" in critical
+    assert rest == ".project-card{padding:1rem}@media (max-width:600px){.project-card{padding:0}}"
+
+
+def test_collapse_whitespace_leaves_pre_and_scripts_alone():
+    html = "<p>a    b</p>\n\n<pre>  keep\n  this  </pre><script>let  x = 1;</script>"
+    assert collapse_whitespace(html) == "<p>a b</p> <pre>  keep\n  this  </pre><script>let  x = 1;</script>"
+
+
+def test_inline_css_is_split_and_scripts_deferred():
+    html = (
+        "<html><head><style>\n  header{top:0}\n  .project-card{padding:1rem}\n</style></head>"
+        "<body><header>Hi</header><script>\n  init();\n</script>"
+        '<script src="app.js"></script></body></html>'
+    )
+    optimized, report = optimize_portfolio_html(html)
+    head, body = optimized.split("</head>")
+    assert "<style>header{top:0}</style>" in head
+    assert "project-card" not in head
+    assert body.endswith("<style>.project-card{padding:1rem}</style></body></html>")
+    assert '<script type="module">init();</script>' in body
+    assert '<script src="app.js" defer></script>' in body
+    assert report["before_bytes"] == len(html)
+    assert report["saved_bytes"] == report["before_bytes"] - report["after_bytes"]
+    assert report["critical_css_bytes"] == len("header{top:0}")
+
+
+def test_linked_stylesheet_becomes_an_async_preload():
+    html = '<html><head><link rel="stylesheet" href="style.css"></head><body></body></html>'
+    optimized, _ = optimize_portfolio_html(html, css_href="style.css", css_src="nav{margin:0}.footer{color:red}")
+    assert "<style>nav{margin:0}</style>" in optimized
+    assert '<link rel="preload" href="style.css" as="style"' in optimized
+    assert '<noscript><link rel="stylesheet" href="style.css"></noscript>' in optimized
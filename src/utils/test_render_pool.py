@@ -0,0 +1,61 @@
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+import pytest
+
+try:
+    import weasyprint  # noqa: F401
+except (ImportError, OSError) as e:  # OSError: Pango/Cairo libraries are missing
+    pytest.skip(f"WeasyPrint is not available: {e}", allow_module_level=True)
+
+from src.utils.render_pool import RenderWorkerPool, RenderPoolUnavailable
+from src.utils.resume_html_pdf import WARMUP_PAYLOAD
+
+
+def _wait_until_ready(pool, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while not pool.is_ready():
+        assert time.monotonic() < deadline, "render workers did not warm up"
+        time.sleep(0.05)
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**kwargs):
+        pool = RenderWorkerPool(**kwargs)
+        pools.append(pool)
+        _wait_until_ready(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_workers_are_recycled_after_max_renders(make_pool):
+    pool = make_pool(workers=1, max_renders=2)
+    for _ in range(5):
+        assert pool.render(WARMUP_PAYLOAD, timeout=60).startswith(b"%PDF")
+    stats = pool.stats()
+    assert stats["renders"] == 5
+    assert stats["recycled"] >= 2
+    assert stats["crashed"] == 0
+
+
+def test_timed_out_worker_is_replaced(make_pool):
+    pool = make_pool(workers=1)
+    with pytest.raises(FutureTimeout):
+        pool.render(WARMUP_PAYLOAD, timeout=1e-6)
+    assert pool.stats()["timed_out"] == 1
+    # The stuck worker is gone; its warmed replacement takes the next render
+    assert pool.render(WARMUP_PAYLOAD, timeout=60).startswith(b"%PDF")
+    assert pool.stats()["workers"] == 1
+
+
+def test_closed_pool_asks_for_in_process_render(make_pool):
+    pool = make_pool(workers=1)
+    pool.shutdown()
+    assert not pool.is_ready()
+    with pytest.raises(RenderPoolUnavailable):
+        pool.submit(WARMUP_PAYLOAD)
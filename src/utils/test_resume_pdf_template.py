@@ -0,0 +1,62 @@
+import copy
+import pytest
+from reportlab import rl_config
+from src.utils.resume_pdf_template import ResumeRenderer
+
+RESUME = {
+    "name": "Jane Doe",
+    "role": "Backend Engineer",
+    "email": "jane@example.com",
+    "summary": "Builds reliable services.",
+    "skills": ["Python", "SQL", "Flask"],
+    "experience": [
+        {"title": "Engineer", "company": "Example", "years": "2020-2024",
+         "details": ["Cut p95 latency by 40%", "Led the storage migration"]},
+    ],
+    "education": [{"degree": "B.Sc.", "institution": "Example University", "years": "2016-2020",
+                   "details": ["First class honours"]}],
+    "projects": [{"name": "Resume Builder", "role": "Author", "description": "Generates PDFs."}],
+    "additional": ["Fluent in Spanish"],
+}
+
+
+@pytest.fixture(autouse=True)
+def invariant_pdfs(monkeypatch):
+    # Fixed creation date and document id, so equal layouts give equal bytes
+    monkeypatch.setattr(rl_config, "invariant", 1)
+
+
+def test_cached_rebuild_matches_a_fresh_render():
+    renderer = ResumeRenderer()
+    renderer.render_to_bytes(RESUME)
+
+    edited = copy.deepcopy(RESUME)
+    edited["experience"][0]["details"].append("Mentored two engineers")
+    cached = renderer.render_to_bytes(edited)
+
+    assert cached == ResumeRenderer().render_to_bytes(edited)
+    assert cached.startswith(b"%PDF")
+
+
+def test_repeated_render_is_byte_identical():
+    renderer = ResumeRenderer()
+    assert renderer.render_to_bytes(RESUME) == renderer.render_to_bytes(RESUME)
+
+
+def test_only_edited_sections_are_rebuilt():
+    renderer = ResumeRenderer()
+    renderer.render_to_bytes(RESUME)
+    edited = dict(RESUME, education=[{"degree": "M.Sc.", "institution": "Example University"}])
+    renderer.render_to_bytes(edited)
+
+    sections = renderer.cache_stats()["sections"]
+    assert sections["education"] == {"hits": 0, "misses": 2}
+    for section in ("header", "skills", "experience", "projects", "additional"):
+        assert sections[section] == {"hits": 1, "misses": 1}
+
+
+def test_streaming_render_matches_the_cached_path():
+    renderer = ResumeRenderer()
+    with renderer.render_streaming(RESUME) as spool:
+        streamed = spool.read()
+    assert streamed == renderer.render_to_bytes(RESUME)
@@ -0,0 +1,78 @@
+import threading
+import time
+import pytest
+from src.utils.single_flight import SingleFlight
+
+
+def _wait_for_coalesced(flight, count):
+    while flight.stats()["coalesced"] < count:
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    release = threading.Event()
+    executions = []
+    results = []
+
+    def fn():
+        executions.append(1)
+        release.wait()
+        return "answer"
+
+    def call():
+        results.append(flight.do("key", fn))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    # Every caller has arrived once all but the leader have been coalesced
+    _wait_for_coalesced(flight, 7)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert executions == [1]
+    assert results == ["answer"] * 8
+    assert flight.stats() == {"calls": 8, "executions": 1, "coalesced": 7, "in_flight": 0}
+
+
+def test_waiters_receive_the_leaders_exception():
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def fn():
+        release.wait()
+        raise ValueError("boom")
+
+    def call():
+        try:
+            flight.do("key", fn)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    _wait_for_coalesced(flight, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert errors == ["boom"] * 4
+
+
+def test_finished_calls_are_not_cached():
+    flight = SingleFlight()
+    counter = iter(range(10))
+    assert flight.do("key", lambda: next(counter)) == 0
+    assert flight.do("key", lambda: next(counter)) == 1
+    assert flight.stats()["executions"] == 2
+
+
+def test_failed_call_is_not_left_in_flight():
+    flight = SingleFlight()
+    with pytest.raises(KeyError):
+        flight.do("a", lambda: {}["missing"])
+    assert flight.do("b", lambda: "b") == "b"
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,23 @@
+import io
+import zipfile
+from src.utils.zip_stream import ZipStreamWriter, iter_zip
+
+
+def test_streamed_archive_is_a_valid_zip():
+    entries = [("a.txt", b"alpha" * 100), ("b.pdf", b"%PDF-1.7 beta")]
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(iter_zip(entries))))
+    assert archive.testzip() is None
+    assert archive.namelist() == ["a.txt", "b.pdf"]
+    assert archive.read("a.txt") == b"alpha" * 100
+    assert archive.read("b.pdf") == b"%PDF-1.7 beta"
+
+
+def test_each_entry_is_emitted_as_it_is_added():
+    writer = ZipStreamWriter()
+    first = writer.add("a.txt", b"alpha")
+    assert first.startswith(b"PK\x03\x04")  # local header of the first entry
+    second = writer.add("b.txt", b"beta", compress_type=zipfile.ZIP_STORED)
+    archive = zipfile.ZipFile(io.BytesIO(first + second + writer.close()))
+    assert archive.getinfo("a.txt").compress_type == zipfile.ZIP_DEFLATED
+    assert archive.getinfo("b.txt").compress_type == zipfile.ZIP_STORED
+    assert archive.testzip() is None
@@ -0,0 +1,70 @@
+import io
+import time
+import zipfile
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable sink that hands written bytes back out in chunks."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        if data:
+            self._chunks.append(bytes(data))
+            self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStreamWriter:
+    """
+    Builds a ZIP archive incrementally without ever holding more than the
+    current entry in memory. Because the sink is not seekable, zipfile writes
+    data descriptors after each entry, so the archive can be sent to the client
+    while later entries are still being produced.
+
+    Usage:
+        writer = ZipStreamWriter()
+        yield writer.add("a.txt", b"...")
+        yield writer.close()
+    """
+
+    def __init__(self, compression=zipfile.ZIP_DEFLATED):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(self._sink, mode="w", compression=compression)
+
+    def add(self, name: str, data: bytes, compress_type=None) -> bytes:
+        """Adds one entry and returns the archive bytes produced so far."""
+        info = zipfile.ZipInfo(name, date_time=time.localtime(time.time())[:6])
+        info.compress_type = self._zip.compression if compress_type is None else compress_type
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, data)
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        """Writes the central directory and returns the trailing archive bytes."""
+        self._zip.close()
+        return self._sink.drain()
+
+
+def iter_zip(entries, compression=zipfile.ZIP_DEFLATED):
+    """Yields the bytes of a ZIP archive built from an iterable of (name, data) pairs."""
+    writer = ZipStreamWriter(compression=compression)
+    for name, data in entries:
+        chunk = writer.add(name, data)
+        if chunk:
+            yield chunk
+    yield writer.close()